@@ -1,24 +1,19 @@
 #!/usr/bin/env python3
 
 import argparse
-import dataclasses
 import enum
+import functools
+import itertools
 import typing
 
-import git
 import logging
+import operator
 import os
 import pprint
+import string
 import sys
 import yaml
 
-import component_descriptor as cd
-
-import ccc.oci
-import ocm.upload
-import cnudie.retrieve
-import version as cc_version
-
 logger = logging.getLogger('gardenlinux-cli')
 
 own_dir = os.path.abspath(os.path.dirname(__file__))
@@ -26,9 +21,9 @@ ci_dir = os.path.join(own_dir, 'ci')
 
 sys.path.insert(1, ci_dir)
 
-import glci.aws   # noqa: E402
 import glci.util  # noqa: E402
 import glci.model # noqa: E402
+import glci.s3    # noqa: E402
 import paths      # noqa: E402
 
 
@@ -104,7 +99,29 @@ def _publishing_cfg(parsed):
 
     return cfg
 
+
+@functools.lru_cache
+def _gitrepo(path: str=paths.gardenlinux_dir):
+    import git # late import because unneeded for ls-manifests
+
+    return git.Repo(path=path)
+
+
+def _expand_commit(commit: str) -> str:
+    # only spawn git if commit is not already a full commit-sha
+    if len(commit) != 40 or not all(c in string.hexdigits for c in commit):
+        commit = _gitrepo().git.rev_parse(commit)
+        logger.info(f'expanded commit to {commit}')
+
+    return commit
+
+
+def _epoch_of(version: str) -> int:
+    return int(version.partition('.')[0])
+
 def ls_manifests():
+    import version as cc_version # late import because unneeded for the other functions
+
     parser = argparse.ArgumentParser()
 
     _add_flavourset_args(parser)
@@ -134,71 +151,80 @@ def ls_manifests():
     parsed = parser.parse_args()
 
     flavour_sets = _flavoursets(parsed)
-    flavours = []
-    for fs in flavour_sets:
-        flavours.extend(fs.flavours())
-
-    version = parsed.version
+    # consumed only once (by the listing below) - no need to materialise
+    flavours = itertools.chain.from_iterable(fs.flavours() for fs in flavour_sets)
 
-    def iter_manifest_prefixes():
+    def manifest_prefix(flavour):
         key_prefix = glci.model.ReleaseIdentifier.manifest_key_prefix
         version_prefix = parsed.version_prefix
 
-        for f_ in flavours:
-            cname = glci.model.canonical_name(
-                platform=f_.platform,
-                mods=f_.modifiers,
-                architecture=f_.architecture,
-                version=version,
-            )
-            prefix_ = f'{key_prefix}/{cname}'
+        cname = glci.model.canonical_name(
+            platform=flavour.platform,
+            mods=flavour.modifiers,
+            architecture=flavour.architecture,
+            version=parsed.version,
+        )
+        prefix_ = f'{key_prefix}/{cname}'
 
-            if version_prefix:
-                prefix_ = f'{prefix_}-{version_prefix}'
+        if version_prefix:
+            prefix_ = f'{prefix_}-{version_prefix}'
 
-            yield prefix_
+        return prefix_
 
     cfg = _publishing_cfg(parsed)
-    s3_client = glci.aws.session(cfg.origin_buildresult_bucket.aws_cfg_name).client('s3')
+    s3_client = glci.s3.s3_client_for_aws_cfg_name(cfg.origin_buildresult_bucket.aws_cfg_name)
+
+    bucket_name = cfg.origin_buildresult_bucket.bucket_name
+
+    def list_manifest_keys(flavour):
+        # calculating the prefix spawns a subprocess - so do this in the worker as well
+        prefix = manifest_prefix(flavour)
+        paginator = s3_client.get_paginator('list_objects_v2')
+        return [
+            entry['Key']
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+            for entry in page.get('Contents', ())
+        ]
 
     manifests = list()
-    for prefix in iter_manifest_prefixes():
-        matching_manifests = s3_client.list_objects_v2(
-            Bucket=cfg.origin_buildresult_bucket.bucket_name,
-            Prefix=prefix,
-        )
-        if matching_manifests['KeyCount'] == 0:
-            continue
-        for entry in matching_manifests['Contents']:
-            key = entry['Key']
+    # one listing per flavour - run them concurrently, as they are bound by s3-roundtrips
+    for keys in glci.util.run_concurrently(list_manifest_keys, flavours, max_workers=32):
+        for key in keys:
             _, version, commit = key.rsplit('-', 2)
             if version in ["experimental", "today"] or commit == "local":
                 continue
-            epoch, _ = version.split('.')
+            epoch, _, _ = version.partition('.')
             s = glci.model.S3Manifest(
                 manifest_key=key,
                 epoch=epoch,
                 version=version,
                 committish=commit
             )
-            manifests.append(s)
-
-    manifests.sort(key=lambda v: cc_version.greatest_version([cc_version.parse_to_semver(v.version)]))
+            # parse version once, so it can be used as (cheap) sort-key
+            manifests.append((cc_version.parse_to_semver(version), s))
 
     if parsed.print == 'greatest':
-        m = manifests.pop()
+        if not manifests:
+            logger.error('no matching release-manifests found')
+            exit(1)
+
+        # only the greatest version is of interest - no need to sort all manifests (on ties, pick
+        # the last one, as popping from the sorted list did)
+        _, m = max(reversed(manifests), key=operator.itemgetter(0))
         if parsed.yaml:
             version = glci.model.S3ManifestVersion(
                 epoch=m.epoch,
                 version=m.version,
                 committish=m.committish
             )
-            with open(parsed.yaml[0], "w") as f:
-                f.write(yaml.safe_dump(dataclasses.asdict(version)))
+            with open(parsed.yaml[0], "wb") as f:
+                yaml.dump(version, f, Dumper=glci.util.EnumValueYamlDumper, encoding='utf-8')
         else:
             print(f"{m.version} {m.committish}")
     else:
-        for m in manifests:
+        manifests.sort(key=operator.itemgetter(0))
+
+        for _, m in manifests:
             if parsed.print == 'all':
                 print(f"{m.manifest_key}")
             elif parsed.print == 'versions':
@@ -208,8 +234,13 @@ def ls_manifests():
 
 
 def publish_release_set():
-    import publish      # late import because unneeded for the other funtions
-    import replicate    # late import because unneeded for the other funtions
+    # late imports because unneeded for the other functions
+    import ccc.oci
+    import ocm.upload
+
+    import component_descriptor as cd
+    import publish
+    import replicate
 
     parser = argparse.ArgumentParser(
         description='run all sub-steps for publishing gardenlinux to all target hyperscalers',
@@ -261,11 +292,7 @@ def publish_release_set():
     parser.add_argument(
         '--phase',
         default=None,
-        choices=(
-            phase_sync,
-            phase_publish,
-            phase_component_descriptor,
-        ),
+        choices=all_phases,
         help='if set, only run until specified phase (default: run all)',
     )
     parser.add_argument(
@@ -299,7 +326,7 @@ def publish_release_set():
 
     else:
         with open(parsed.version_file[0]) as f:
-            version_yaml = yaml.safe_load(f)
+            version_yaml = yaml.load(f, Loader=glci.util.YamlLoader)
             version = version_yaml['version']
             commit = version_yaml['committish']
 
@@ -307,10 +334,7 @@ def publish_release_set():
 
     flavour_sets = _flavoursets(parsed)
 
-    if len(commit) != 40:
-        repo = git.Repo(path=paths.gardenlinux_dir)
-        commit = repo.git.rev_parse(commit)
-        logger.info(f'expanded commit to {commit}')
+    commit = _expand_commit(commit)
 
     flavour_set_names = [flavour_set.name for flavour_set in flavour_sets]
     logger.info(
@@ -320,20 +344,12 @@ def publish_release_set():
     if not (phase := parsed.phase):
         phases_to_run = all_phases
     else:
-        if phase == phase_sync:
-            phases_to_run = phase_sync,
-        elif phase == phase_publish:
-            if parsed.skip_previous_phases:
-                phases_to_run = phase_publish,
-            else:
-                phases_to_run = phase_sync, phase_publish
-        elif phase == phase_component_descriptor:
-            if parsed.skip_previous_phases:
-                phases_to_run = phase_component_descriptor,
-            else:
-                phases_to_run = all_phases
+        # phases are ordered - run up to (and including) the specified one
+        phase_idx = all_phases.index(phase)
+        if parsed.skip_previous_phases:
+            phases_to_run = all_phases[phase_idx:phase_idx + 1]
         else:
-            raise NotImplementedError(phase)
+            phases_to_run = all_phases[:phase_idx + 1]
 
     logger.info('phases to run:\n- ' + '\n- '.join(phases_to_run))
     print()
@@ -364,21 +380,22 @@ def publish_release_set():
     if not target_manifest_buckets:
         target_manifest_buckets = (source_manifest_bucket,)
 
-    s3_session = glci.aws.session(source_manifest_bucket.aws_cfg_name)
-    s3_client = s3_session.client('s3')
-
-    release_manifests = []
-    for fs in flavour_sets:
-        release_manifests.extend(
-            glci.util.find_releases(
-                s3_client=s3_client,
-                bucket_name=source_manifest_bucket.bucket_name,
-                fset=fs,
-                build_committish=commit,
-                version=version,
-                gardenlinux_epoch=int(version.split('.')[0]),
-            )
+    s3_client = glci.s3.s3_client_for_aws_cfg_name(source_manifest_bucket.aws_cfg_name)
+
+    # flavours may be contained in more than one flavour-set - only look them up (and publish
+    # them) once
+    flavours = {flavour for fs in flavour_sets for flavour in fs.flavours()}
+    release_manifests = {
+        manifest.s3_key: manifest
+        for manifest in glci.util.find_releases_for_flavours(
+            s3_client=s3_client,
+            bucket_name=source_manifest_bucket.bucket_name,
+            flavours=flavours,
+            build_committish=commit,
+            version=version,
+            gardenlinux_epoch=_epoch_of(version),
         )
+    }
 
     if not release_manifests:
         phase_logger.fatal(
@@ -398,7 +415,7 @@ def publish_release_set():
     if run_sync:
         replicas_present = replicate.check_replicated_image_blobs(
             publishing_cfg=cfg,
-            release_manifests=release_manifests,
+            release_manifests=release_manifests.values(),
         )
 
         if not replicas_present:
@@ -413,12 +430,13 @@ def publish_release_set():
 
     phase_logger.info('validating publishing-cfg')
 
-    for manifest in release_manifests:
+    for manifest in release_manifests.values():
         target_cfg = cfg.target(platform=manifest.platform, absent_ok=True)
         if not target_cfg:
             if (on_absent := parsed.on_absent_cfg) == 'warn':
                 phase_logger.warning(
-                    f'no cfg for {manifest.platform=} - will NOT publish!'
+                    'no cfg for manifest.platform=%r - will NOT publish!',
+                    manifest.platform,
                 )
                 continue
             elif on_absent == 'fail':
@@ -435,44 +453,35 @@ def publish_release_set():
     else:
         run_publish = False
 
-    for idx, manifest in enumerate(release_manifests):
-        if not run_publish:
-            continue
-
-        if parsed.platforms and not manifest.platform in parsed.platforms:
-            logger.info(f'skipping {manifest.platform} (filter was set via ARGV)')
-            continue
-
+    def publish_release_manifest(manifest: glci.model.OnlineReleaseManifest):
         name = manifest.release_identifier().canonical_release_manifest_key()
         phase_logger.info(name)
 
-        target_cfg = cfg.target(platform=manifest.platform, absent_ok=True)
-        if not target_cfg: # we already validated above that user is okay to skip
-            continue
-
         if parsed.print_manifest:
             pprint.pprint(manifest)
 
         if manifest.published_image_metadata:
-            if not parsed.force:
-                phase_logger.info('already published -> skipping publishing phase')
-                continue
-            else:
-                phase_logger.warning('force-publishing')
+            phase_logger.warning('force-publishing')
 
-        phase_logger.info(f'will publish image to {manifest.platform}')
+        phase_logger.info('will publish image to %s', manifest.platform)
 
         updated_manifest = publish.publish_image(
             release=manifest,
             publishing_cfg=cfg,
         )
-        release_manifests[idx] = updated_manifest
 
-        phase_logger.info(f"{idx=}, {target_manifest_buckets=}")
+        if updated_manifest == manifest:
+            phase_logger.info('%s: release-manifest unchanged - not updating', manifest.s3_key)
+            return updated_manifest
+
+        phase_logger.info('target_manifest_buckets=%s', target_manifest_buckets)
 
         for target_manifest_bucket in target_manifest_buckets:
-            target = f'{target_manifest_bucket.bucket_name}/{manifest.s3_key}'
-            phase_logger.info(f'updating release-manifest at {target}')
+            phase_logger.info(
+                'updating release-manifest at %s/%s',
+                target_manifest_bucket.bucket_name,
+                manifest.s3_key,
+            )
 
             glci.util.upload_release_manifest(
                 s3_client=s3_client,
@@ -481,7 +490,39 @@ def publish_release_set():
                 manifest=updated_manifest,
             )
 
-        phase_logger.info(f'image publishing for {manifest.platform} succeeded')
+        phase_logger.info('image publishing for %s succeeded', manifest.platform)
+
+        return updated_manifest
+
+    if run_publish:
+        platform_filter = frozenset(parsed.platforms)
+
+        keys_to_publish = []
+        for key, manifest in release_manifests.items():
+            if platform_filter and not manifest.platform in platform_filter:
+                logger.info('skipping %s (filter was set via ARGV)', manifest.platform)
+                continue
+
+            target_cfg = cfg.target(platform=manifest.platform, absent_ok=True)
+            if not target_cfg: # we already validated above that user is okay to skip
+                continue
+
+            if manifest.published_image_metadata and not parsed.force:
+                phase_logger.info(
+                    '%s: already published -> skipping publishing phase',
+                    manifest.s3_key,
+                )
+                continue
+
+            keys_to_publish.append(key)
+
+        # platforms are independent of each other - publish them concurrently (remaining platforms
+        # are not started after a failure)
+        published_manifests = glci.util.run_concurrently(
+            publish_release_manifest,
+            [release_manifests[key] for key in keys_to_publish],
+        )
+        release_manifests.update(zip(keys_to_publish, published_manifests))
 
     if not run_publish:
         phase_logger.info('skipped image-publishing (--skip-previous-phases)')
@@ -500,7 +541,7 @@ def publish_release_set():
         version=version,
         commit=commit,
         publishing_cfg=cfg,
-        release_manifests=release_manifests,
+        release_manifests=list(release_manifests.values()),
     )
 
     if parsed.print_component_descriptor:
@@ -526,8 +567,11 @@ def publish_release_set():
 
 
 def cleanup_release_set():
-    import cleanup # late import because it is unneeded for the other functions in this swiss-army-knife of a tool
-    pp = pprint.PrettyPrinter(indent=4)
+    # late imports because unneeded for the other functions in this swiss-army-knife of a tool
+    import ccc.oci
+    import cnudie.retrieve
+
+    import cleanup
 
     parser = argparse.ArgumentParser(
         description='clean a release set from all target hyperscalers',
@@ -545,7 +589,7 @@ def cleanup_release_set():
     )
     parser.add_argument(
         '--skip-component-descriptor',
-        help='just delete artefacts based on their release manifests, do not touch component descriptors',
+        help='just delete artefacts based on their release manifests, do not retrieve component descriptors (only effective if --commit is given)',
         dest='skip_component_descriptor',
         action='store_true',
         default=False
@@ -589,7 +633,7 @@ def cleanup_release_set():
 
     if bool(parsed.version_file):
         with open(parsed.version_file[0]) as f:
-            input_ = yaml.safe_load(f)
+            input_ = yaml.load(f, Loader=glci.util.YamlLoader)
             version = input_['version']
     elif bool(parsed.version):
         version = parsed.version
@@ -600,13 +644,11 @@ def cleanup_release_set():
 
     commit = None
 
-    if parsed.skip_component_descriptor and parsed.committish:
-        commit = parsed.committish
-        if len(commit) != 40:
-            repo = git.Repo(path=paths.gardenlinux_dir)
-            commit = repo.git.rev_parse(commit)
-            logger.info(f'expanded commit to {commit}')
-    else:
+    if parsed.committish:
+        commit = _expand_commit(parsed.committish)
+
+    # component-descriptor is only needed to determine commit (or if it was requested to be printed)
+    if not commit or (parsed.print_component_descriptor and not parsed.skip_component_descriptor):
         if not parsed.ocm_repo:
             ocm_repo_base_url = cfg.ocm.ocm_repository
         else:
@@ -622,13 +664,15 @@ def cleanup_release_set():
         gardenlinux_component = component_descriptor_lookup(('github.com/gardenlinux/gardenlinux', version)).component
 
         if parsed.print_component_descriptor:
-            pp.pprint(gardenlinux_component)
+            pprint.pprint(gardenlinux_component, indent=4)
 
-        for s in gardenlinux_component.sources:
-            if s.name != "gardenlinux":
-                continue
-            commit = s.access.commit
-            break
+        if not commit:
+            commit = next(
+                (s.access.commit for s in gardenlinux_component.sources if s.name == 'gardenlinux'),
+                None,
+            )
+            if commit is None:
+                raise RuntimeError("no 'gardenlinux' source in component-descriptor")
 
     target_manifest_buckets = tuple(cfg.target_manifest_buckets)
     if len(target_manifest_buckets) == 0:
@@ -636,60 +680,83 @@ def cleanup_release_set():
     elif len(target_manifest_buckets) > 1:
         raise RuntimeError(f"more than one target manifest buckets specified - this is currently not supported")
 
-    s3_session = glci.aws.session(target_manifest_buckets[0].aws_cfg_name)
-    s3_client = s3_session.client('s3')
+    s3_client = glci.s3.s3_client_for_aws_cfg_name(target_manifest_buckets[0].aws_cfg_name)
 
     flavour_sets = _flavoursets(parsed)
-    release_manifests = []
-    for fs in flavour_sets:
-        release_manifests.extend(
-            glci.util.find_releases(
-                s3_client=s3_client,
-                bucket_name=target_manifest_buckets[0].bucket_name,
-                fset=fs,
-                build_committish=commit,
-                version=version,
-                gardenlinux_epoch=int(version.split('.')[0]),
-            )
-        )
-
-    logger.info(f"found {len(release_manifests)} release manifests in bucket {target_manifest_buckets[0].bucket_name}")
+    # flavours may be contained in more than one flavour-set - only look them up (and clean
+    # them up) once
+    flavours = {flavour for fs in flavour_sets for flavour in fs.flavours()}
+    # consumed lazily - cleanup of found manifests starts while lookup is still ongoing
+    release_manifests = glci.util.find_releases_for_flavours(
+        s3_client=s3_client,
+        bucket_name=target_manifest_buckets[0].bucket_name,
+        flavours=flavours,
+        build_committish=commit,
+        version=version,
+        gardenlinux_epoch=_epoch_of(version),
+    )
 
     # todo: sanity check that it matches the published metadata in the component descriptor
 
-    for idx, manifest in enumerate(release_manifests):
-        if parsed.platforms and not manifest.platform in parsed.platforms:
-            logger.info(f'skipping {manifest.platform} (filter was set via ARGV)')
-            continue
+    platform_filter = frozenset(parsed.platforms)
 
-        if not manifest.published_image_metadata:
-            logger.info(f"manifest for platform {manifest.platform}/{manifest.architecture.value} does not contain publishing metadata, skipping")
-            continue
+    def iter_manifests_to_cleanup():
+        manifest_count = 0
+        for manifest in release_manifests:
+            manifest_count += 1
 
-        target_cfg = cfg.target(platform=manifest.platform, absent_ok=False)
-        if not target_cfg:
-            continue
+            if platform_filter and not manifest.platform in platform_filter:
+                logger.info('skipping %s (filter was set via ARGV)', manifest.platform)
+                continue
 
-        logger.info(f'will cleanup images from {manifest.platform}/{manifest.architecture.value}')
+            if not manifest.published_image_metadata:
+                logger.info(
+                    'manifest for platform %s/%s does not contain publishing metadata, skipping',
+                    manifest.platform,
+                    manifest.architecture.value,
+                )
+                continue
 
-        updated_manifest = cleanup.cleanup_image(
-            release=manifest,
-            publishing_cfg=cfg,
-            dry_run=parsed.dry_run
-        )
+            target_cfg = cfg.target(platform=manifest.platform, absent_ok=False)
+            if not target_cfg:
+                continue
+
+            logger.info(
+                'will cleanup images from %s/%s',
+                manifest.platform,
+                manifest.architecture.value,
+            )
+            yield manifest
 
+        logger.info(f"found {manifest_count} release manifests in bucket {target_manifest_buckets[0].bucket_name}")
+
+    # dry-runs only log - clean up one release at a time there, so output is grouped by release
+    # (within a release, aws-cfgs / regions are still processed concurrently, and may interleave)
+    for manifest, updated_manifest in cleanup.cleanup_images(
+        releases=iter_manifests_to_cleanup(),
+        publishing_cfg=cfg,
+        dry_run=parsed.dry_run,
+        max_workers=1 if parsed.dry_run else 4,
+    ):
         if parsed.print_manifest:
             pprint.pprint(updated_manifest)
 
-        release_manifests[idx] = updated_manifest
+        # dry-runs always return release unchanged - still report what would be updated
+        if not parsed.dry_run and updated_manifest == manifest:
+            logger.info('%s: release-manifest unchanged - not updating', manifest.s3_key)
+            continue
 
         for target_manifest_bucket in target_manifest_buckets:
-            target = f'{target_manifest_bucket.bucket_name}/{manifest.s3_key}'
+            target_bucket_name = target_manifest_bucket.bucket_name
             if parsed.dry_run:
-                logger.warning(f'DRY RUN: would update release-manifest at {target}')
+                logger.warning(
+                    'DRY RUN: would update release-manifest at %s/%s',
+                    target_bucket_name,
+                    manifest.s3_key,
+                )
                 continue
             else:
-                logger.info(f'updating release-manifest at {target}')
+                logger.info('updating release-manifest at %s/%s', target_bucket_name, manifest.s3_key)
 
                 glci.util.upload_release_manifest(
                     s3_client=s3_client,
@@ -698,18 +765,29 @@ def cleanup_release_set():
                     manifest=updated_manifest,
                 )
 
-        logger.info(f'cleaning up images for {manifest.platform}/{manifest.architecture.value} succeeded')
+        logger.info(
+            'cleaning up images for %s/%s succeeded',
+            manifest.platform,
+            manifest.architecture.value,
+        )
 
 
-def main():
-    cmd_name = os.path.basename(sys.argv[0]).replace('-', '_')
+# commands are dispatched by name of the executable (see symlinks next to this script); each
+# command late-imports what it needs, so only the invoked one pays the import-cost
+_COMMANDS = {
+    'ls-manifests': ls_manifests,
+    'publish-release-set': publish_release_set,
+    'cleanup-release-set': cleanup_release_set,
+}
 
-    module_symbols = sys.modules[__name__]
 
-    func = getattr(module_symbols, cmd_name, None)
+def main():
+    cmd_name = os.path.basename(sys.argv[0]).replace('_', '-')
+
+    func = _COMMANDS.get(cmd_name)
 
     if not func:
-        print(f'ERROR: {cmd_name} is not defined')
+        print(f'ERROR: {cmd_name} is not defined - known commands: {", ".join(_COMMANDS)}')
         sys.exit(1)
 
     func()
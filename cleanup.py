@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
+import collections
+import concurrent.futures
 import logging
 
 import functools
 import dataclasses
+import typing
 
 import glci.aws
 import glci.gcp
@@ -20,6 +23,51 @@ from glci.model import AwsPublishedImageSet
 
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache
+def _cfg_factory():
+    return ci.util.ctx().cfg_factory()
+
+
+@functools.lru_cache
+def _gcp_cfg(cfg_name: str):
+    return _cfg_factory().gcp(cfg_name)
+
+
+@functools.lru_cache
+def _ccee_cfg(cfg_name: str):
+    return _cfg_factory().ccee(cfg_name)
+
+
+@functools.lru_cache
+def _openstack_env_cfgs(environment_cfg_name: str) -> tuple[gm.OpenstackEnvironment, ...]:
+    openstack_environments_cfg = _ccee_cfg(environment_cfg_name)
+
+    username = openstack_environments_cfg.credentials().username()
+    password = openstack_environments_cfg.credentials().passwd()
+
+    return tuple((
+        gm.OpenstackEnvironment(
+            project_name=project.name(),
+            domain=project.domain(),
+            region=project.region(),
+            auth_url=project.auth_url(),
+            username=username,
+            password=password,
+        ) for project in openstack_environments_cfg.projects()
+    ))
+
+
+@functools.lru_cache
+def _azure_service_principal_cfg(cfg_name: str):
+    return _cfg_factory().azure_service_principal(cfg_name=cfg_name)
+
+
+@functools.lru_cache
+def _azure_shared_gallery_cfg(cfg_name: str):
+    return _cfg_factory().azure_shared_gallery(cfg_name=cfg_name)
+
+
 def cleanup_image(
     release: gm.OnlineReleaseManifest,
     publishing_cfg: gm.PublishingCfg,
@@ -29,24 +77,14 @@ def cleanup_image(
     if dry_run:
         logger.warning(f"Running in DRY RUN mode {dry_run=}")
 
-    if release.platform == 'ali':
-        cleanup_function = cleanup_alicloud_images
-    elif release.platform == 'aws':
-        cleanup_function = cleanup_aws_images_by_id
-    elif release.platform == 'gcp':
-        cleanup_function = cleanup_gcp_images
-    elif release.platform == 'azure':
-        cleanup_function = cleanup_azure_community_gallery_images
-    elif release.platform == 'openstack':
-        cleanup_function = cleanup_openstack_images_by_id
-    elif release.platform == 'openstackbaremetal':
-        cleanup_function = cleanup_openstack_images_by_id
-    elif release.platform == 'oci':
-        cleanup_function = None
-    else:
+    if not release.platform in _cleanup_functions:
         logger.warning(f'do not know how to clean up {release.platform=}, yet')
         return release
 
+    if not (cleanup_function := _cleanup_functions[release.platform]):
+        logger.warning(f'cleanup not implemented for {release.platform=}')
+        return release
+
     try:
         cleanup_function(release, publishing_cfg, dry_run)
         if dry_run:
@@ -59,6 +97,74 @@ def cleanup_image(
         raise
 
 
+def cleanup_images(
+    releases: typing.Iterable[gm.OnlineReleaseManifest],
+    publishing_cfg: gm.PublishingCfg,
+    dry_run: bool,
+    max_workers: int = 4,
+) -> typing.Generator[tuple[gm.OnlineReleaseManifest, gm.OnlineReleaseManifest], None, None]:
+    '''
+    cleans up given releases concurrently (cleanup is bound by cloud-provider API roundtrips, and
+    releases are independent of each other). `releases` is consumed lazily, so cleanups start
+    while releases are still being looked up. Yields (release, cleaned-up release) pairs in order
+    of completion. If a cleanup fails, remaining cleanups are cancelled; all releases cleaned up
+    successfully until then are still yielded before the exception is re-raised. Clients (AWS)
+    and credentials (Azure) are shared between threads, both are thread-safe. Each cleanup fans
+    out further (e.g. per aws-cfg, region and snapshot) - keep `max_workers` low to not run into
+    API rate-limits.
+    '''
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # {future: release} of cleanups whose results were not yet yielded
+        futures = {}
+        try:
+            # `releases` may be lazy (e.g. still being looked up) - start cleanups as releases
+            # arrive, and hand out cleanups done meanwhile
+            for release in releases:
+                futures[executor.submit(
+                    cleanup_image,
+                    release=release,
+                    publishing_cfg=publishing_cfg,
+                    dry_run=dry_run,
+                )] = release
+                for future in [future for future in futures if future.done()]:
+                    yield futures.pop(future), future.result()
+
+            for future in concurrent.futures.as_completed(tuple(futures)):
+                yield futures.pop(future), future.result()
+        except Exception:
+            # do not start cleanup of remaining releases after a failure (waits for running ones)
+            executor.shutdown(cancel_futures=True)
+
+            # images of successfully cleaned-up releases are gone - still hand out those releases
+            # so callers can update the release-manifests accordingly
+            for future, release in futures.items():
+                if future.cancelled() or future.exception():
+                    continue
+                yield release, future.result()
+            raise
+        except BaseException: # e.g. GeneratorExit, KeyboardInterrupt
+            executor.shutdown(cancel_futures=True)
+            raise
+
+
+def _for_each_aws_cfg(
+    aws_publishing_cfg: gm.PublishingTargetAWS,
+    function: typing.Callable,
+):
+    '''
+    calls `function` with `mk_session` for each aws-cfg (i.e. partition / account). The cfgs are
+    independent of each other, so calls are done concurrently.
+    '''
+    aws_cfgs = aws_publishing_cfg.aws_cfgs
+
+    def call_for_aws_cfg(aws_cfg):
+        function(
+            mk_session=functools.partial(glci.aws.caching_session, aws_cfg=aws_cfg.aws_cfg_name),
+        )
+
+    glci.util.run_concurrently(call_for_aws_cfg, aws_cfgs, max_workers=len(aws_cfgs))
+
+
 def cleanup_aws_images(
     release: gm.OnlineReleaseManifest,
     publishing_cfg: gm.PublishingCfg,
@@ -67,14 +173,14 @@ def cleanup_aws_images(
     target_image_name = glci.aws.target_image_name_for_release(release=release)
     aws_publishing_cfg: gm.PublishingTargetAWS = publishing_cfg.target(platform=release.platform)
 
-    for aws_cfg in aws_publishing_cfg.aws_cfgs:
-        aws_cfg_name = aws_cfg.aws_cfg_name
-        mk_session = functools.partial(glci.aws.session, aws_cfg=aws_cfg_name)
-        glci.aws.unregister_images_by_name(
-            mk_session=mk_session,
+    _for_each_aws_cfg(
+        aws_publishing_cfg=aws_publishing_cfg,
+        function=functools.partial(
+            glci.aws.unregister_images_by_name,
             image_name=target_image_name,
-            dry_run=dry_run
-        )
+            dry_run=dry_run,
+        ),
+    )
 
 
 def cleanup_aws_images_by_id(
@@ -84,14 +190,14 @@ def cleanup_aws_images_by_id(
 ):
     aws_publishing_cfg: gm.PublishingTargetAWS = publishing_cfg.target(platform=release.platform)
 
-    for aws_cfg in aws_publishing_cfg.aws_cfgs:
-        aws_cfg_name = aws_cfg.aws_cfg_name
-        mk_session = functools.partial(glci.aws.session, aws_cfg=aws_cfg_name)
-        glci.aws.unregister_images_by_id(
-            mk_session=mk_session,
+    _for_each_aws_cfg(
+        aws_publishing_cfg=aws_publishing_cfg,
+        function=functools.partial(
+            glci.aws.unregister_images_by_id,
             images=AwsPublishedImageSet(release.published_image_metadata.published_aws_images),
-            dry_run=dry_run
-        )
+            dry_run=dry_run,
+        ),
+    )
 
 
 def cleanup_alicloud_images(
@@ -127,8 +233,7 @@ def cleanup_gcp_images(
     dry_run: bool = False
 ):
     gcp_publishing_cfg: gm.PublishingTargetGCP = publishing_cfg.target(release.platform)
-    cfg_factory = ci.util.ctx().cfg_factory()
-    gcp_cfg = cfg_factory.gcp(gcp_publishing_cfg.gcp_cfg_name)
+    gcp_cfg = _gcp_cfg(gcp_publishing_cfg.gcp_cfg_name)
     storage_client = glci.gcp.cloud_storage_client(gcp_cfg)
     compute_client = glci.gcp.authenticated_build_func(gcp_cfg)('compute', 'v1')
 
@@ -151,39 +256,32 @@ def cleanup_openstack_images_by_id(
         platform=release.platform,
     )
 
-    cfg_factory = ci.util.ctx().cfg_factory()
-    openstack_environments_cfg = cfg_factory.ccee(
-        openstack_publishing_cfg.environment_cfg_name,
-    )
-
-    username = openstack_environments_cfg.credentials().username()
-    password = openstack_environments_cfg.credentials().passwd()
-
     openstack_env_cfgs = {
-        project.region(): gm.OpenstackEnvironment(
-                project_name=project.name(),
-                domain=project.domain(),
-                region=project.region(),
-                auth_url=project.auth_url(),
-                username=username,
-                password=password,
-        ) for project in openstack_environments_cfg.projects()
+        openstack_env.region: openstack_env
+        for openstack_env in _openstack_env_cfgs(openstack_publishing_cfg.environment_cfg_name)
     }
 
     published_images = release.published_image_metadata.published_openstack_images
 
+    # group by region, so each region authenticates only once
+    image_ids_by_region = collections.defaultdict(list)
     for image in published_images:
-        openstack_env = openstack_env_cfgs.get(image.region_name, None)
-        if not openstack_env:
+        if not image.region_name in openstack_env_cfgs:
             logger.error(f"Cannot remove image {image.image_id} because of missing OpenStack config for region {image.region_name}")
             continue
 
-        glci.openstack_image.delete_single_image(
-            openstack_environment_cfg=openstack_env,
-            image_id=image.image_id,
-            dry_run=dry_run
+        image_ids_by_region[image.region_name].append(image.image_id)
+
+    def delete_images(region_image_ids: tuple[str, list[str]]):
+        region_name, image_ids = region_image_ids
+        glci.openstack_image.delete_images_by_id(
+            openstack_environment_cfg=openstack_env_cfgs[region_name],
+            image_ids=image_ids,
+            dry_run=dry_run,
         )
 
+    glci.util.run_concurrently(delete_images, image_ids_by_region.items())
+
 
 def cleanup_openstack_images(
     release: gm.OnlineReleaseManifest,
@@ -194,27 +292,10 @@ def cleanup_openstack_images(
         platform=release.platform,
     )
 
-    cfg_factory = ci.util.ctx().cfg_factory()
-    openstack_environments_cfg = cfg_factory.ccee(
-        openstack_publishing_cfg.environment_cfg_name,
-    )
-
-    username = openstack_environments_cfg.credentials().username()
-    password = openstack_environments_cfg.credentials().passwd()
-
-    openstack_env_cfgs = tuple((
-        gm.OpenstackEnvironment(
-            project_name=project.name(),
-            domain=project.domain(),
-            region=project.region(),
-            auth_url=project.auth_url(),
-            username=username,
-            password=password,
-        ) for project in openstack_environments_cfg.projects()
-    ))
-
     glci.openstack_image.delete_images_for_release(
-        openstack_environments_cfgs=openstack_env_cfgs,
+        openstack_environments_cfgs=_openstack_env_cfgs(
+            openstack_publishing_cfg.environment_cfg_name,
+        ),
         release=release,
         suffix=openstack_publishing_cfg.suffix,
         dry_run=dry_run
@@ -226,13 +307,12 @@ def cleanup_azure_community_gallery_images(
     publishing_cfg: gm.PublishingCfg,
     dry_run: bool = False
 ):
-    cfg_factory = ci.util.ctx().cfg_factory()
     azure_publishing_cfgs: list[gm.PublishingTargetAzure] = publishing_cfg.target_multi(platform=release.platform)
 
     for azure_publishing_cfg in azure_publishing_cfgs:
         logger.info(f"targetting {azure_publishing_cfg.cloud}")
 
-        azure_principal = cfg_factory.azure_service_principal(
+        azure_principal = _azure_service_principal_cfg(
             cfg_name=azure_publishing_cfg.service_principal_cfg_name,
         )
 
@@ -243,7 +323,7 @@ def cleanup_azure_community_gallery_images(
             subscription_id=azure_principal.subscription_id(),
         )
 
-        shared_gallery_cfg = cfg_factory.azure_shared_gallery(
+        shared_gallery_cfg = _azure_shared_gallery_cfg(
             cfg_name=azure_publishing_cfg.gallery_cfg_name,
         )
         shared_gallery_cfg_serialized = gm.AzureSharedGalleryCfg(
@@ -260,12 +340,12 @@ def cleanup_azure_community_gallery_images(
             regions=azure_publishing_cfg.gallery_regions,
         )
 
-        published_gallery_images = release.published_image_metadata.published_gallery_images
-
-        for gallery_image in published_gallery_images:
-            if gallery_image.azure_cloud != azure_publishing_cfg.cloud.value:
-                continue
-
+        published_gallery_images = [
+            gallery_image
+            for gallery_image in release.published_image_metadata.published_gallery_images
+            if gallery_image.azure_cloud == azure_publishing_cfg.cloud.value
+        ]
+        def delete_gallery_image(gallery_image):
             glci.az.delete_from_azure_community_gallery(
                 community_gallery_image_id=gallery_image.community_gallery_image_id,
                 service_principal_cfg=azure_principal_serialized,
@@ -273,3 +353,17 @@ def cleanup_azure_community_gallery_images(
                 azure_cloud=azure_publishing_cfg.cloud,
                 dry_run=dry_run
             )
+
+        glci.util.run_concurrently(delete_gallery_image, published_gallery_images, max_workers=8)
+
+
+# platform -> cleanup-function (None: known platform w/o cleanup)
+_cleanup_functions = {
+    'ali': cleanup_alicloud_images,
+    'aws': cleanup_aws_images_by_id,
+    'gcp': cleanup_gcp_images,
+    'azure': cleanup_azure_community_gallery_images,
+    'openstack': cleanup_openstack_images_by_id,
+    'openstackbaremetal': cleanup_openstack_images_by_id,
+    'oci': None,
+}
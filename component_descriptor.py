@@ -1,8 +1,7 @@
+import functools
 import logging
-import typing
 
 import glci
-import glci.aws
 import glci.model
 import glci.s3
 import glci.util
@@ -12,37 +11,57 @@ import ocm
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache
+def _debian_packages(
+    s3_client,
+    bucket_name: str,
+    key: str,
+) -> tuple[str, ...]:
+    resp = s3_client.get_object(
+        Bucket=bucket_name,
+        Key=key,
+    )
+
+    return tuple(resp['Body'].read().decode('utf-8').splitlines())
+
+
 def _iter_debian_packages(
     release_manifest,
     s3_client,
-) -> typing.Generator[str, None, None]:
+) -> tuple[str, ...]:
+    # package-list is needed for both vm-image- and rootfs-resource - only retrieve it once
     manifest_file_path = release_manifest.path_by_suffix('.manifest')
-    resp = s3_client.get_object(
-        Bucket=manifest_file_path.s3_bucket_name,
-        Key=manifest_file_path.s3_key,
+    return _debian_packages(
+        s3_client=s3_client,
+        bucket_name=manifest_file_path.s3_bucket_name,
+        key=manifest_file_path.s3_key,
     )
 
-    for line in resp['Body'].iter_lines():
-        yield line.decode('utf-8')
-
 
 def iter_resources(
     release_manifests: list[glci.model.OnlineReleaseManifest],
     version: str,
     s3_client,
 ):
-    for release_manifest in release_manifests:
-        yield virtual_machine_image_resource(
-            release_manifest=release_manifest,
-            version=version,
-            s3_client=s3_client,
-        )
-        yield _image_rootfs_resource(
-            release_manifest=release_manifest,
-            s3_client=s3_client,
-            version=version,
+    def resources(release_manifest: glci.model.OnlineReleaseManifest):
+        # build both resources in same worker, so package-manifest is retrieved only once
+        return (
+            virtual_machine_image_resource(
+                release_manifest=release_manifest,
+                version=version,
+                s3_client=s3_client,
+            ),
+            _image_rootfs_resource(
+                release_manifest=release_manifest,
+                s3_client=s3_client,
+                version=version,
+            ),
         )
 
+    # resources are bound by s3-roundtrips - build them concurrently (preserving order)
+    for manifest_resources in glci.util.run_concurrently(resources, release_manifests, max_workers=32):
+        yield from manifest_resources
+
 
 def component_descriptor(
     version: str,
@@ -52,8 +71,7 @@ def component_descriptor(
 ) -> ocm.ComponentDescriptor:
     ocm_repository = publishing_cfg.ocm.ocm_repository
 
-    s3_session = glci.aws.session(publishing_cfg.origin_buildresult_bucket.aws_cfg_name)
-    s3_client = s3_session.client('s3')
+    s3_client = glci.s3.s3_client_for_aws_cfg_name(publishing_cfg.origin_buildresult_bucket.aws_cfg_name)
 
     descriptor = ocm.ComponentDescriptor(
         meta=ocm.Metadata(schemaVersion=ocm.SchemaVersion.V2),
@@ -90,14 +108,11 @@ def component_descriptor(
                 )
             ],
             componentReferences=[],
-            resources=[
-                r for r
-                in iter_resources(
-                    release_manifests=release_manifests,
-                    version=version,
-                    s3_client=s3_client,
-                )
-            ],
+            resources=list(iter_resources(
+                release_manifests=release_manifests,
+                version=version,
+                s3_client=s3_client,
+            )),
         ),
     )
 
@@ -119,7 +134,6 @@ def virtual_machine_image_resource(
         ),
     ]
 
-    s3_client = s3_client
     packages = _iter_debian_packages(
         release_manifest,
         s3_client=s3_client,
@@ -127,19 +141,22 @@ def virtual_machine_image_resource(
     package_aliases = glci.util.package_aliases()
     package_versions = []
 
+    aliases_for_package = package_aliases.get
+
     for package in packages:
-        match package.split(' '):
-            case [name, package_version]:
-                package_versions.append({
-                    'name': name,
-                    'aliases': package_aliases.get(name) or [],
-                    'version': package_version,
-                })
-            case _:
-                logger.warning(
-                    f'Unable to parse package-string {package}. No version-information will be '
-                    'added to the component-descriptor for this package.'
-                )
+        if len(parts := package.split(' ')) != 2:
+            logger.warning(
+                f'Unable to parse package-string {package}. No version-information will be '
+                'added to the component-descriptor for this package.'
+            )
+            continue
+
+        name, package_version = parts
+        package_versions.append({
+            'name': name,
+            'aliases': aliases_for_package(name) or [],
+            'version': package_version,
+        })
 
     if package_versions:
         labels.append(
@@ -195,13 +212,10 @@ def _image_rootfs_resource(
           value={
               'modifiers': release_manifest.modifiers,
               'buildTimestamp': release_manifest.build_timestamp,
-              'debianPackages': [
-                  p for p
-                  in _iter_debian_packages(
-                      release_manifest,
-                      s3_client=s3_client,
-                  )
-              ],
+              'debianPackages': list(_iter_debian_packages(
+                  release_manifest,
+                  s3_client=s3_client,
+              )),
           }
         ),
         ocm.Label(
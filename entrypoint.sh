@@ -1,8 +1,17 @@
 #!/bin/sh
 set -eu
 
-git clone -q -b "$BUILDER_BRANCH" --single-branch https://github.com/gardenlinux/builder.git /gardenlinux-builder
-git clone -q -b "$GARDENLINUX_BRANCH" --single-branch https://github.com/gardenlinux/gardenlinux.git /gardenlinux
+# clones are independent of each other - run them concurrently (wait for each, so that
+# failures are not swallowed)
+# builder: only the worktree is used (parse_features)
+git clone -q -b "$BUILDER_BRANCH" --single-branch --depth 1 https://github.com/gardenlinux/builder.git /gardenlinux-builder &
+builder_clone_pid=$!
+# gardenlinux: history is needed to resolve (abbreviated) commits, blobs are only needed for the worktree
+git clone -q -b "$GARDENLINUX_BRANCH" --single-branch --filter=blob:none https://github.com/gardenlinux/gardenlinux.git /gardenlinux &
+gardenlinux_clone_pid=$!
+
+wait "$builder_clone_pid"
+wait "$gardenlinux_clone_pid"
 
 [ -z "$CREDENTIALS_KEY" ] || {
   CREDENTIALS_JSON_PATH="$(mktemp)"
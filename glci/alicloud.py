@@ -21,6 +21,7 @@ import model.alicloud
 import oss2
 
 import glci.model
+import glci.s3
 import glci.util
 
 logger = logging.getLogger(__name__)
@@ -80,13 +81,12 @@ class AlicloudImageMaker:
             return
 
         with tempfile.TemporaryFile() as tf:
-            blob = s3_client.get_object(
+            s3_client.download_fileobj(
                 Bucket=s3_bucket_name,
                 Key=s3_bucket_key,
-            )['Body']
-
-            while chunk := blob.read(4096):
-                tf.write(chunk)
+                Fileobj=tf,
+                Config=glci.s3.transfer_config,
+            )
 
             tf.seek(0)
 
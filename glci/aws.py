@@ -1,7 +1,5 @@
-import concurrent.futures
 import dataclasses
 import enum
-import io
 import logging
 import pprint
 import time
@@ -10,6 +8,7 @@ import functools
 
 import boto3
 import botocore.client
+import botocore.config
 from botocore.exceptions import ClientError
 import ctx
 import model.aws
@@ -20,6 +19,15 @@ import glci.util
 
 logger = logging.getLogger(__name__)
 
+# shared clients are used from thread-pools (up to 64 workers) - the default connection-pool
+# (10 connections) would otherwise serialise them. Higher concurrency makes throttling more
+# likely, so allow more (backed-off) retries than the default (3 attempts in standard-mode)
+client_config = botocore.config.Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={'mode': 'standard', 'max_attempts': 10},
+)
+
 
 def response_ok(response: dict):
     resp_meta = response['ResponseMetadata']
@@ -83,40 +91,56 @@ def import_snapshot(
     return import_task_id
 
 
+def _polling_intervals(
+    initial_seconds: float,
+    max_seconds: float,
+    factor: float=1.5,
+) -> typing.Generator[float, None, None]:
+    # exponential backoff: poll early (in case resource is ready soon), but issue fewer
+    # (throttled) describe-calls for long-running operations
+    interval = initial_seconds
+    while True:
+        yield interval
+        interval = min(interval * factor, max_seconds)
+
+
+def _snapshot_task_detail(
+    ec2_client: botocore.client.BaseClient,
+    snapshot_task_id: str,
+) -> dict:
+    return ec2_client.describe_import_snapshot_tasks(
+        ImportTaskIds=[snapshot_task_id]
+    )['ImportSnapshotTasks'][0]['SnapshotTaskDetail']
+
+
 def wait_for_snapshot_import(
     ec2_client: botocore.client.BaseClient,
     snapshot_task_id: str,
-    polling_interval_seconds: int=15,
+    polling_interval_seconds: int=5,
+    max_polling_interval_seconds: int=30,
 ):
     """
     @return snapshot_id
     """
-    def describe_import_snapshot_task():
-        st = ec2_client.describe_import_snapshot_tasks(
-            ImportTaskIds=[snapshot_task_id]
-        )['ImportSnapshotTasks'][0]
-        return st
-
-    def current_status() -> TaskStatus:
-        st = describe_import_snapshot_task()
-        st = TaskStatus(st['SnapshotTaskDetail']['Status'])
-        return st
-
-    def snapshot_id():
-        st = describe_import_snapshot_task()
-        task_id = st['SnapshotTaskDetail']['SnapshotId']
-        return task_id
-
-    while not (status := current_status()) is TaskStatus.COMPLETED:
+    polling_intervals = _polling_intervals(
+        initial_seconds=polling_interval_seconds,
+        max_seconds=max_polling_interval_seconds,
+    )
+
+    while True:
+        # reuse response (for errors and snapshot_id) rather than describing again
+        details = _snapshot_task_detail(
+            ec2_client=ec2_client,
+            snapshot_task_id=snapshot_task_id,
+        )
+        if (status := TaskStatus(details['Status'])) is TaskStatus.COMPLETED:
+            return details['SnapshotId']
+
         logger.info(f'{snapshot_task_id=}: {status=}')
 
         if status is TaskStatus.DELETED:
-            status = describe_import_snapshot_task()
-            details = status['SnapshotTaskDetail']
             raise RuntimeError(f'image uploaded by {snapshot_task_id=} was rejected: {details=}')
-        time.sleep(polling_interval_seconds)
-
-    return snapshot_id()
+        time.sleep(next(polling_intervals))
 
 
 def _to_aws_architecture(
@@ -180,12 +204,21 @@ def register_image(
     return result['ImageId']
 
 
+@functools.lru_cache
+def _region_names(
+    ec2_client: botocore.client.BaseClient,
+) -> tuple[str, ...]:
+    # enabled regions (per account) change very rarely - only retrieve them once per client
+    return tuple(
+        region['RegionName'] for region in ec2_client.describe_regions()['Regions']
+    )
+
+
 def enumerate_region_names(
     ec2_client: botocore.client.BaseClient,
     regions_to_include: list[str] = None
 ):
-    for region in ec2_client.describe_regions()['Regions']:
-        region_name = region['RegionName']
+    for region_name in _region_names(ec2_client=ec2_client):
         if regions_to_include is not None:
             if region_name in regions_to_include:
                 yield region_name
@@ -193,22 +226,54 @@ def enumerate_region_names(
             yield region_name
 
 
+def _image_state(
+    ec2_client: botocore.client.BaseClient,
+    image_id: str,
+) -> ImageState:
+    image_details = ec2_client.describe_images(ImageIds=[image_id])['Images'][0]
+    return ImageState(image_details['State'])
+
+
 def wait_for_image_state(
     ec2_client: botocore.client.BaseClient,
     image_id: str,
     target_state=ImageState.AVAILABLE,
-    polling_interval_seconds: int=15,
+    polling_interval_seconds: int=5,
+    max_polling_interval_seconds: int=30,
 ):
-    def current_image_state():
-        image_details = ec2_client.describe_images(ImageIds=[image_id])['Images'][0]
-        return ImageState(image_details['State'])
+    polling_intervals = _polling_intervals(
+        initial_seconds=polling_interval_seconds,
+        max_seconds=max_polling_interval_seconds,
+    )
+
+    while True:
+        image_state = _image_state(ec2_client=ec2_client, image_id=image_id)
+        if image_state is target_state:
+            return image_state
 
-    while not (image_state := current_image_state()) is target_state:
         if image_state.is_erroneous():
             raise RuntimeError(f'{image_id=}: {image_state=}')
-        time.sleep(polling_interval_seconds)
+        time.sleep(next(polling_intervals))
+
 
-    return image_state
+def _for_each_region(
+    region_img_map: typing.Dict[str, str], # {region_name: ami_id}
+    function: typing.Callable[[str, str], None],
+):
+    '''
+    calls `function(region_name, image_id)` for each entry of `region_img_map`. Regional
+    endpoints are independent of each other, so calls are done concurrently. Callers must create
+    their clients inside `function`.
+    '''
+    def call_for_region(region_image: tuple[str, str]):
+        region_name, image_id = region_image
+        function(region_name, image_id)
+
+    glci.util.run_concurrently(
+        call_for_region,
+        region_img_map.items(),
+        max_workers=len(region_img_map),
+    )
 
 
 def wait_for_images(
@@ -217,15 +282,17 @@ def wait_for_images(
     target_state=ImageState.AVAILABLE,
 ):
     logger.info(f'will wait for {len(region_img_map)} image(s) to reach {target_state=}')
-    for region_name, image_id in region_img_map.items():
+
+    def wait_for_image(region_name: str, image_id: str):
         logger.info(f'waiting for {image_id=}')
-        # as we want to wait for _all_ images, it should be OK not to parallelise polling
         image_state = wait_for_image_state(
             ec2_client=mk_session(region_name=region_name).client('ec2'),
             image_id=image_id,
             target_state=target_state,
         )
         logger.info(f'{image_id=} reached state {image_state=}')
+
+    _for_each_region(region_img_map=region_img_map, function=wait_for_image)
     logger.info('all images reached target-state')
 
 
@@ -233,7 +300,7 @@ def set_images_public(
     mk_session: callable,
     region_img_map: typing.Dict[str, str], # {region_name: ami_id}
 ):
-    for region_name, image_id in region_img_map.items():
+    def set_image_public(region_name: str, image_id: str):
         session_ = mk_session(region_name=region_name)
         ec2_client = session_.client('ec2')
 
@@ -255,6 +322,8 @@ def set_images_public(
             logger.error(f"Failed to set {image_id=} public in {region_name=}")
             raise e
 
+    _for_each_region(region_img_map=region_img_map, function=set_image_public)
+
 
 def copy_image(
     mk_session: callable,
@@ -265,11 +334,9 @@ def copy_image(
 ):
     """
     @param mk_session: callable accepting `region_name`, returning authenticated boto3-session
+    @return dict{<target_region>: <ami_id>}
     """
-    for target_region in target_regions:
-        if target_region == src_region_name:
-            continue
-
+    def copy_to_region(target_region: str):
         session_ = mk_session(region_name=target_region)
         ec2_client = session_.client('ec2')
 
@@ -279,9 +346,16 @@ def copy_image(
             Name=image_name,
             CopyImageTags=True
         )
-        # XXX: return (new) image-AMI
         response_ok(res)
-        yield target_region, res['ImageId']
+        return res['ImageId']
+
+    target_regions = tuple(r for r in target_regions if r != src_region_name)
+
+    # copies are started independently (per target region) - start them concurrently
+    return dict(zip(
+        target_regions,
+        glci.util.run_concurrently(copy_to_region, target_regions, max_workers=32),
+    ))
 
 
 def image_ids_by_name(
@@ -289,7 +363,7 @@ def image_ids_by_name(
     image_name: str,
     region_names: typing.Sequence[str],
 ):
-    for region_name in region_names:
+    def image_id(region_name: str):
         session_ = mk_session(region_name=region_name)
         ec2 = session_.client('ec2')
         images = ec2.describe_images(Filters=[{'Name': 'name', 'Values': [image_name]}])
@@ -297,11 +371,22 @@ def image_ids_by_name(
         images = images['Images']
         if len(images) < 1:
             logger.warning(f'did not find {image_name=} in {region_name=}')
-            continue
+            return None
         if len(images) > 1:
             raise ValueError('found more than one image (this is a bug)')
 
-        yield region_name, images[0]['ImageId']
+        return images[0]['ImageId']
+
+    # regional endpoints are independent of each other - query them concurrently, and yield found
+    # image-ids as they complete
+    for region_name, found_image_id in glci.util.iter_concurrently(
+        image_id,
+        region_names,
+        max_workers=32,
+    ):
+        if found_image_id is None:
+            continue
+        yield region_name, found_image_id
 
 
 def unregister_images_by_name(
@@ -316,43 +401,34 @@ def unregister_images_by_name(
     else:
         region_names = tuple(region_names)
 
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(region_names))
-
-    results = []
-    for region_name, image_id in image_ids_by_name(
-        mk_session=mk_session,
-        image_name=image_name,
-        region_names=region_names,
-    ):
-        def unregister_image():
-            ec2 = mk_session(region_name=region_name).client('ec2')
-            if dry_run:
-                logger.warning(f'DRY RUN: would unregister {image_id=} in {region_name}')
-            else:
-                ec2.deregister_image(ImageId=image_id)
-                logger.info(f'unregistered {image_id=} in {region_name}')
-        results.append(executor.submit(unregister_image))
-
-    concurrent.futures.wait(results)
-
+    def unregister_image(region_name: str, image_id: str):
+        ec2 = mk_session(region_name=region_name).client('ec2')
+        if dry_run:
+            logger.warning(f'DRY RUN: would unregister {image_id=} in {region_name}')
+        else:
+            ec2.deregister_image(ImageId=image_id)
+            logger.info(f'unregistered {image_id=} in {region_name}')
 
-def _get_snapshots_for_image(
-        client: botocore.client.BaseClient,
-        image_id: str,
-):
-    snapshots = []
-    response = client.describe_images(
-        Owners=["self"], Filters=[{"Name": "image-id", "Values": [image_id]}]
+    _for_each_region(
+        region_img_map=dict(image_ids_by_name(
+            mk_session=mk_session,
+            image_name=image_name,
+            region_names=region_names,
+        )),
+        function=unregister_image,
     )
 
-    if response["Images"]:
-        image = response["Images"][0]
 
-        for bdm in image.get("BlockDeviceMappings"):
-            snapshots.append(bdm["Ebs"]["SnapshotId"])
-    else:
-        logger.warning(f"no snapshots found for {image_id=}")
-    return snapshots
+def _snapshot_ids_for_image(
+        image: dict,
+) -> list[str]:
+    '''
+    @param image: image as returned by `describe_images`
+    '''
+    return [
+        bdm["Ebs"]["SnapshotId"]
+        for bdm in image.get("BlockDeviceMappings", ())
+    ]
 
 
 def _delete_snapshots(
@@ -360,45 +436,47 @@ def _delete_snapshots(
         snapshot_ids: list[str],
         dry_run: bool
 ):
-    for snapshot in snapshot_ids:
+    def delete_snapshot(snapshot: str):
         if dry_run:
             logger.warning(f"DRY RUN: would delete {snapshot=}")
         else:
             client.delete_snapshot(SnapshotId=snapshot)
             logger.info(f"deleted {snapshot=}")
 
+    if len(snapshot_ids) < 2:
+        for snapshot in snapshot_ids:
+            delete_snapshot(snapshot)
+        return
+
+    # snapshots are independent of each other (but must be deleted after image deregistration)
+    glci.util.run_concurrently(delete_snapshot, snapshot_ids, max_workers=8)
+
 
 def unregister_images_by_id(
     mk_session: callable,
     images: glci.model.AwsPublishedImageSet,
     dry_run: bool
 ):
-    executor = concurrent.futures.ThreadPoolExecutor()
-    results = []
-
-    for image in images.published_aws_images:
-        def unregister_image(
-            img,
-        ):
-            ec2 = mk_session(region_name=img.aws_region_id).client('ec2')
-            response = response_ok(ec2.describe_images(
-                Owners=["self"], Filters=[{"Name": "image-id", "Values": [img.ami_id]}]
-            ))
+    def unregister_image(
+        img: glci.model.AwsPublishedImage,
+    ):
+        ec2 = mk_session(region_name=img.aws_region_id).client('ec2')
+        response = response_ok(ec2.describe_images(
+            Owners=["self"], Filters=[{"Name": "image-id", "Values": [img.ami_id]}]
+        ))
 
-            if len(response["Images"]) == 0:
-                logger.warning(f"AMI with id {img.ami_id} is no longer present in {img.aws_region_id}")
+        if len(response["Images"]) == 0:
+            logger.warning(f"AMI with id {img.ami_id} is no longer present in {img.aws_region_id}")
+        else:
+            snapshots = _snapshot_ids_for_image(response["Images"][0])
+            if dry_run:
+                logger.warning(f'DRY RUN: would unregister {img.ami_id=} in {img.aws_region_id}')
             else:
-                snapshots = _get_snapshots_for_image(ec2, img.ami_id)
-                if dry_run:
-                    logger.warning(f'DRY RUN: would unregister {img.ami_id=} in {img.aws_region_id}')
-                else:
-                    ec2.deregister_image(ImageId=img.ami_id)
-                    logger.info(f'unregistered {img.ami_id=} in {img.aws_region_id}')
-                _delete_snapshots(ec2, snapshots, dry_run=dry_run)
-
-        results.append(executor.submit(unregister_image(image)))
+                ec2.deregister_image(ImageId=img.ami_id)
+                logger.info(f'unregistered {img.ami_id=} in {img.aws_region_id}')
+            _delete_snapshots(ec2, snapshots, dry_run=dry_run)
 
-    concurrent.futures.wait(results)
+    glci.util.run_concurrently(unregister_image, images.published_aws_images, max_workers=32)
 
 
 def import_image(
@@ -485,8 +563,8 @@ def upload_and_register_gardenlinux_image(
             f'Running AWS-Publication for aws-config {aws_cfg_name}.'
         )
         _session = session(aws_cfg=aws_cfg_name)
-        mk_session = functools.partial(session, aws_cfg=aws_cfg_name)
-        ec2_client = _session.client('ec2')
+        mk_session = functools.partial(caching_session, aws_cfg=aws_cfg_name)
+        ec2_client = mk_session().client('ec2')
         s3_client = _session.client('s3')
 
         aws_release_artifact = glci.util.vm_image_artefact_for_platform('aws')
@@ -516,20 +594,16 @@ def upload_and_register_gardenlinux_image(
             ec2_client=ec2_client,
             snapshot_task_id=snapshot_task_id,
         )
-        attach_tags(ec2_client=ec2_client, resources=[snapshot_id], tags=tags)
         logger.info(f'import task finished {snapshot_id=}')
 
         uefi_data = None
         if release.secureboot:
             logger.info('retrieving secureboot certificates')
 
-            buf = io.BytesIO()
-            s3_client.download_fileobj(
+            uefi_data = s3_client.get_object(
                 Bucket=bucket_name,
                 Key=release.path_by_suffix('.secureboot.aws-efivars').s3_key,
-                Fileobj=buf,
-            )
-            uefi_data = buf.getvalue().decode()
+            )['Body'].read().decode()
 
         initial_ami_id = register_image(
             ec2_client=ec2_client,
@@ -539,20 +613,19 @@ def upload_and_register_gardenlinux_image(
             uefi_required=release.require_uefi,
             uefi_data=uefi_data,
         )
-        attach_tags(ec2_client=ec2_client, resources=[initial_ami_id], tags=tags)
+        # tag snapshot and image in one call (copies inherit tags through CopyImageTags)
+        attach_tags(ec2_client=ec2_client, resources=[snapshot_id, initial_ami_id], tags=tags)
         logger.info(f'registered {initial_ami_id=}')
 
         region_names = tuple(enumerate_region_names(ec2_client=ec2_client, regions_to_include=aws_cfg.copy_regions))
 
         try:
-            image_map = dict(
-                copy_image(
-                    mk_session=mk_session,
-                    ami_image_id=initial_ami_id,
-                    image_name=target_image_name,
-                    src_region_name=_session.region_name,
-                    target_regions=region_names,
-                )
+            image_map = copy_image(
+                mk_session=mk_session,
+                ami_image_id=initial_ami_id,
+                image_name=target_image_name,
+                src_region_name=_session.region_name,
+                target_regions=region_names,
             )
         except:
             logger.warning('an error occurred whilst copying images - will remove them')
@@ -598,13 +671,22 @@ def upload_and_register_gardenlinux_image(
     return dataclasses.replace(release, published_image_metadata=published_image_set)
 
 
+@functools.lru_cache
+def _cfg_factory():
+    return ctx.cfg_factory()
+
+
+@functools.lru_cache
+def _aws_cfg(aws_cfg_name: str) -> model.aws.AwsProfile:
+    return _cfg_factory().aws(aws_cfg_name)
+
+
 def session(
     aws_cfg: str | model.aws.AwsProfile,
     region_name: str=None,
 ):
     if isinstance(aws_cfg, str):
-        cfg_factory = ctx.cfg_factory()
-        aws_cfg = cfg_factory.aws(aws_cfg)
+        aws_cfg = _aws_cfg(aws_cfg)
 
     region_name = region_name or aws_cfg.region()
 
@@ -613,3 +695,40 @@ def session(
         aws_secret_access_key=aws_cfg.secret_access_key(),
         region_name=region_name,
     )
+
+
+@functools.lru_cache
+def _client(
+    aws_cfg_name: str,
+    region_name: str | None,
+    service_name: str,
+) -> botocore.client.BaseClient:
+    return session(aws_cfg=aws_cfg_name, region_name=region_name).client(
+        service_name,
+        config=client_config,
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class CachingSession:
+    '''
+    drop-in for boto3-sessions (as returned by `session`) for callers only creating clients.
+    clients are shared per aws-cfg, region and service (creating them is expensive; unlike
+    sessions, they are thread-safe).
+    '''
+    aws_cfg_name: str
+    region_name: str | None = None
+
+    def client(self, service_name: str) -> botocore.client.BaseClient:
+        return _client(
+            aws_cfg_name=self.aws_cfg_name,
+            region_name=self.region_name,
+            service_name=service_name,
+        )
+
+
+def caching_session(
+    aws_cfg: str,
+    region_name: str=None,
+) -> CachingSession:
+    return CachingSession(aws_cfg_name=aws_cfg, region_name=region_name)
@@ -1,22 +1,24 @@
-import base64
-import io
-
 import dataclasses
+import functools
 from datetime import (
     datetime,
     timedelta,
     UTC,
 )
 import logging
+import os
+
+import requests
+import requests.adapters
 
 from azure.mgmt.compute.v2023_07_03.models import (
     ImageVersionSecurityProfile,
     GalleryImageVersionUefiSettings,
     UefiKeySignatures
 )
+from azure.core.pipeline.transport import RequestsTransport
 from azure.storage.blob import (
-    BlobClient,
-    BlobType,
+    ContainerClient,
     ContainerSasPermissions,
     generate_container_sas,
 )
@@ -61,6 +63,26 @@ logger = logging.getLogger(__name__)
 logging.getLogger('azure.core.pipeline.policies.http_logging_policy').setLevel(logging.WARNING)
 
 
+# managed images are typically created / deleted within seconds - poll them more often than
+# the sdk's default (30s). Retry-After headers returned by the service are still honoured.
+managed_image_polling_interval_seconds = 5
+
+# regions not yet supported (although they are returned by the subscription-client)
+unsupported_gallery_regions = frozenset((
+    'brazilus',
+    'indonesiacentral',
+    'jioindiacentral',
+    'jioindiawest',
+))
+
+# the (single) presigned source-url is used for all copy-steps - it must stay valid for the
+# whole copy (default would be one hour), also for large images / slow transfers
+presigned_url_expiry_seconds = 6 * 60 * 60
+
+# upper limit of bytes per "put page from url"-request
+max_copy_step_length = 4 * 1024 * 1024
+
+
 class AzureImageStore:
     """Azure Image Store backed by an container in an Azure Storage Account."""
 
@@ -69,61 +91,90 @@ class AzureImageStore:
         storage_account_name: str,
         storage_account_key: str,
         container_name: str,
-        storage_endpoint: str = "core.windows.net"
+        storage_endpoint: str = "core.windows.net",
+        concurrency: int = None,
     ):
+        """
+        `concurrency` is the maximum number of concurrent requests (e.g. page-copy-steps); it
+        defaults to GLCI_AZ_CONCURRENCY from env, or 16.
+        """
         self.sa_name = storage_account_name
         self.sa_key = storage_account_key
         self.container_name = container_name
         self.storage_endpoint = storage_endpoint
 
-    def copy_from_s3(
-        self,
-        s3_client,
-        s3_bucket_name: str,
-        s3_object_key: str,
-        target_blob_name: str
-    ):
-        """Copy an object from Amazon S3 to an Azure Storage Account
+        if concurrency is None:
+            concurrency = int(os.environ.get('GLCI_AZ_CONCURRENCY', 16))
+        if concurrency < 1:
+            raise ValueError(f'{concurrency=} must be positive')
+        self.concurrency = concurrency
 
-        This will overwrite the contents of the target file if it already exists.
-        """
         connection_string = (
             f"DefaultEndpointsProtocol=https;"
             f"AccountName={self.sa_name};"
             f"AccountKey={self.sa_key};"
             f"EndpointSuffix={self.storage_endpoint}"
         )
-        image_blob = BlobClient.from_connection_string(
+        # size connection-pool to concurrency (default would be 10 connections)
+        session = requests.Session()
+        session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=self.concurrency))
+
+        # blob-clients obtained from container-client share its pipeline (and connection-pool)
+        self._container_client = ContainerClient.from_connection_string(
             conn_str=connection_string,
             container_name=self.container_name,
-            blob_name=target_blob_name,
-            blob_type=BlobType.PageBlob,
+            transport=RequestsTransport(session=session, session_owner=True),
         )
 
+    def copy_from_s3(
+        self,
+        s3_client,
+        s3_bucket_name: str,
+        s3_object_key: str,
+        target_blob_name: str,
+        copy_step_length: int = max_copy_step_length,
+    ):
+        """Copy an object from Amazon S3 to an Azure Storage Account
+
+        This will overwrite the contents of the target file if it already exists. Pages are
+        copied (server-side) in steps of `copy_step_length`, with up to `self.concurrency` steps
+        in flight. As the service accepts at most 4 MiB per step, concurrency is the effective
+        lever for throughput.
+        """
+        if not 0 < copy_step_length <= max_copy_step_length or copy_step_length % 512:
+            raise ValueError(
+                f'{copy_step_length=} must be a positive multiple of 512, at most {max_copy_step_length}'
+            )
+
+        image_blob = self._container_client.get_blob_client(target_blob_name)
+
         file_size_response = s3_client.head_object(Bucket=s3_bucket_name, Key=s3_object_key)
         file_size = file_size_response['ContentLength']
 
         url = s3_client.generate_presigned_url(
             'get_object',
             Params={'Bucket': s3_bucket_name, 'Key': s3_object_key},
+            ExpiresIn=presigned_url_expiry_seconds,
         )
 
         image_blob.create_page_blob(file_size)
-        # max size we can copy in one go is 4 mebibytes. Split the upload in steps with max size of
-        # 4 MiB
-        copy_step_length = 4 * 1024 * 1024
-        offset = 0
-        while offset < file_size:
-            remaining = file_size - offset
-            actual_cp_bytes = min(copy_step_length, remaining)
+        logger.info(f'copying {s3_object_key=} ({file_size=}) with {copy_step_length=} concurrency={self.concurrency}')
 
+        def copy_step(offset: int):
             image_blob.upload_pages_from_url(
                 source_url=url,
                 offset=offset,
-                length=actual_cp_bytes,
+                length=min(copy_step_length, file_size - offset),
                 source_offset=offset,
             )
-            offset += actual_cp_bytes
+
+        # steps are independent of each other, and each is bound by a (server-side) roundtrip -
+        # run them concurrently (the blob-client may be shared between threads)
+        glci.util.run_concurrently(
+            copy_step,
+            range(0, file_size, copy_step_length),
+            max_workers=self.concurrency,
+        )
 
     def get_image_url(self, image_name: str):
         """Generate an url and an sas token to access image in the store and return both."""
@@ -173,6 +224,21 @@ def copy_image_from_s3_to_az_storage_account(
     return store.get_image_url(target_blob_name)
 
 
+@functools.lru_cache
+def _credential(
+    service_principal_cfg: glci.model.AzureServicePrincipalCfg,
+    azure_cloud: glci.model.AzureCloud,
+) -> ClientSecretCredential:
+    # credentials cache their access-tokens (and are thread-safe) - share them, so tokens are
+    # only acquired once per service-principal
+    return ClientSecretCredential(
+        tenant_id=service_principal_cfg.tenant_id,
+        client_id=service_principal_cfg.client_id,
+        client_secret=service_principal_cfg.client_secret,
+        authority=azure_cloud.authority(),
+    )
+
+
 def _get_target_blob_name(release: glci.model.OnlineReleaseManifest, generation: glci.model.AzureHyperVGeneration = None) -> str:
     name = release.canonical_release_manifest_key_suffix()
     if generation and generation == glci.model.AzureHyperVGeneration.V2:
@@ -197,6 +263,15 @@ def _append_hyper_v_generation_architecture_and_usi_or_secureboot(
         s=f"{s}-secureboot"
     return s
 
+@functools.lru_cache
+def _location_names(
+    sbclient: SubscriptionClient,
+    subscription_id: str,
+) -> tuple[str, ...]:
+    # locations are (effectively) static - only list them once (instead of per hyper-v-generation)
+    return tuple(l.name for l in sbclient.subscriptions.list_locations(subscription_id))
+
+
 def _create_shared_image(
     s3_client,
     cclient: ComputeManagementClient,
@@ -259,19 +334,13 @@ def _create_shared_image(
         poller.wait()
 
     regions = {
-        l.name
-        for l in sbclient.subscriptions.list_locations(subscription_id)
-            if gallery_regions is None or l.name in gallery_regions
+        location_name
+        for location_name in _location_names(sbclient=sbclient, subscription_id=subscription_id)
+            if gallery_regions is None or location_name in gallery_regions
     }
     regions.add(shared_gallery_cfg.location) # ensure that the gallery's location is present
 
-    # rm regions not yet supported (although they are returned by the subscription-client)
-    regions -= {
-        'brazilus',
-        'indonesiacentral',
-        'jioindiacentral',
-        'jioindiawest',
-    }
+    regions -= unsupported_gallery_regions
     logger.info(f"gallery {regions=}")
 
     security_profile = None
@@ -287,21 +356,11 @@ def _create_shared_image(
         # )
         # pk = base64.b64encode(buf.getvalue()).decode()
 
-        buf = io.BytesIO()
-        s3_client.download_fileobj(
-            Bucket=release.s3_bucket,
-            Key=release.path_by_suffix('.secureboot.kek.der').s3_key,
-            Fileobj=buf,
-        )
-        kek = base64.b64encode(buf.getvalue()).decode()
-
-        buf = io.BytesIO()
-        s3_client.download_fileobj(
-            Bucket=release.s3_bucket,
-            Key=release.path_by_suffix('.secureboot.db.der').s3_key,
-            Fileobj=buf,
+        kek, db = glci.util.b64encoded_release_files(
+            s3_client=s3_client,
+            release=release,
+            suffixes=('.secureboot.kek.der', '.secureboot.db.der'),
         )
-        db = base64.b64encode(buf.getvalue()).decode()
 
         security_profile = ImageVersionSecurityProfile(
             uefi_settings=GalleryImageVersionUefiSettings(
@@ -429,6 +488,7 @@ def publish_to_azure_community_gallery(
         result = cclient.images.begin_delete(
             resource_group_name=shared_gallery_cfg.resource_group_name,
             image_name=published_name,
+            polling_interval=managed_image_polling_interval_seconds,
         )
         result = result.result()
         logger.info(f'Image deleted {result=}, will re-create now.')
@@ -449,7 +509,8 @@ def publish_to_azure_community_gallery(
                         'caching': 'ReadWrite',
                     }
                 },
-            }
+            },
+            polling_interval=managed_image_polling_interval_seconds,
     )
     logger.info('... waiting for operation to complete')
     result = result.result()
@@ -494,11 +555,9 @@ def publish_azure_image(
     azure_cloud: glci.model.AzureCloud,
 ) -> glci.model.OnlineReleaseManifest:
 
-    credential = ClientSecretCredential(
-        tenant_id=service_principal_cfg.tenant_id,
-        client_id=service_principal_cfg.client_id,
-        client_secret=service_principal_cfg.client_secret,
-        authority=azure_cloud.authority(),
+    credential = _credential(
+        service_principal_cfg=service_principal_cfg,
+        azure_cloud=azure_cloud,
     )
 
     # Copy image from s3 to Azure Storage Account
@@ -601,11 +660,9 @@ def delete_from_azure_community_gallery(
     else:
         logger.info(f"Deleting {community_gallery_image_id=}...")
 
-    credential = ClientSecretCredential(
-        tenant_id=service_principal_cfg.tenant_id,
-        client_id=service_principal_cfg.client_id,
-        client_secret=service_principal_cfg.client_secret,
-        authority=azure_cloud.authority()
+    credential = _credential(
+        service_principal_cfg=service_principal_cfg,
+        azure_cloud=azure_cloud,
     )
     cclient = ComputeManagementClient(credential, service_principal_cfg.subscription_id, base_url=azure_cloud.base_url(), credential_scopes=[azure_cloud.credential_scope()])
 
@@ -668,7 +725,8 @@ def delete_from_azure_community_gallery(
         logger.info(f"Deleting image VHD {image_vhd_name} in resource group {image_vhd_resource_group}...")
         result = cclient.images.begin_delete(
             resource_group_name=image_vhd_resource_group,
-            image_name=image_vhd_name
+            image_name=image_vhd_name,
+            polling_interval=managed_image_polling_interval_seconds,
         )
         logger.info('...waiting for asynchronous operation to complete')
         result.wait()
@@ -1,7 +1,5 @@
-import base64
 import dataclasses
 import functools
-import io
 import tempfile
 import time
 import logging
@@ -15,6 +13,7 @@ import googleapiclient.errors
 import googleapiclient.discovery
 
 import glci.model
+import glci.s3
 import glci.util
 
 
@@ -38,7 +37,7 @@ def upload_image_to_gcs_bucket(
 
     # XXX: rather do streaming
     with tempfile.TemporaryFile() as tfh:
-        resp = s3_client.get_object(
+        resp = s3_client.head_object(
             Bucket=s3_bucket_name,
             Key=raw_image_key,
         )
@@ -49,6 +48,7 @@ def upload_image_to_gcs_bucket(
             Bucket=s3_bucket_name,
             Key=raw_image_key,
             Fileobj=tfh,
+            Config=glci.s3.transfer_config,
         )
         logger().info(f'downloaded image from {s3_bucket_name=}')
 
@@ -124,29 +124,11 @@ def insert_image_to_gce_image_store(
     if release.secureboot:
         logger().info('retrieving secureboot certificates')
 
-        buf = io.BytesIO()
-        s3_client.download_fileobj(
-            Bucket=release.s3_bucket,
-            Key=release.path_by_suffix('.secureboot.pk.der').s3_key,
-            Fileobj=buf,
-        )
-        pk = base64.b64encode(buf.getvalue()).decode()
-
-        buf = io.BytesIO()
-        s3_client.download_fileobj(
-            Bucket=release.s3_bucket,
-            Key=release.path_by_suffix('.secureboot.kek.der').s3_key,
-            Fileobj=buf,
-        )
-        keks = base64.b64encode(buf.getvalue()).decode()
-
-        buf = io.BytesIO()
-        s3_client.download_fileobj(
-            Bucket=release.s3_bucket,
-            Key=release.path_by_suffix('.secureboot.db.der').s3_key,
-            Fileobj=buf,
+        pk, keks, dbs = glci.util.b64encoded_release_files(
+            s3_client=s3_client,
+            release=release,
+            suffixes=('.secureboot.pk.der', '.secureboot.kek.der', '.secureboot.db.der'),
         )
-        dbs = base64.b64encode(buf.getvalue()).decode()
 
         body['shieldedInstanceInitialState'] = {
             'pk': {
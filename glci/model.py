@@ -15,9 +15,15 @@ import yaml
 
 import paths
 
+# prefer libyaml-backed (C) loader if available
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 own_dir = os.path.abspath(os.path.dirname(__file__))
 repo_root = os.path.abspath(os.path.join(
     own_dir, os.path.pardir, os.path.pardir))
+features_dir = os.path.abspath(os.path.join(paths.gardenlinux_dir, 'features'))
+parse_features_binary = os.path.abspath(
+    os.path.join(paths.gardenlinux_builder_dir, 'builder', 'parse_features'))
 
 
 class BuildTarget(enum.Enum):
@@ -168,17 +174,17 @@ class GardenlinuxFlavour:
 
     def __post_init__(self):
         # validate platform and modifiers
-        names = {platform.name for platform in platforms()}
+        names = platform_names()
         if not self.platform in names:
             raise ValueError(
-                f'unknown platform: {self.platform}. known: {names}'
+                f'unknown platform: {self.platform}. known: {set(names)}'
             )
 
-        modifier_names = {modifier.name for modifier in modifiers()}
-        unknown_mods = set(self.modifiers) - modifier_names
+        known_modifiers = modifier_names()
+        unknown_mods = set(self.modifiers) - known_modifiers
         if unknown_mods:
             raise ValueError(
-                f'unknown modifiers: {unknown_mods}. known: {modifier_names}'
+                f'unknown modifiers: {unknown_mods}. known: {set(known_modifiers)}'
             )
 
 
@@ -855,7 +861,7 @@ def _enumerate_feature_files(features_dir=os.path.join(paths.gardenlinux_dir, 'f
 
 def _deserialise_feature(feature_file):
     with open(feature_file) as f:
-        parsed = yaml.safe_load(f)
+        parsed = yaml.load(f, Loader=_YamlLoader)
     # hack: inject name from pardir
     pardir = os.path.basename(os.path.dirname(feature_file))
     parsed['name'] = pardir
@@ -890,8 +896,9 @@ def platforms():
     }
 
 
-def platform_names():
-    return {p.name for p in platforms()}
+@functools.lru_cache
+def platform_names() -> frozenset[str]:
+    return frozenset(p.name for p in platforms())
 
 
 def modifiers():
@@ -902,11 +909,21 @@ def modifiers():
     }
 
 
+@functools.lru_cache
+def modifier_names() -> frozenset[str]:
+    return frozenset(m.name for m in modifiers())
+
+
+@functools.lru_cache
+def _features_by_name():
+    return {feature.name: feature for feature in features()}
+
+
 def feature_by_name(feature_name: str):
-    for feature in features():
-        if feature.name == feature_name:
-            return feature
-    raise ValueError(feature_name)
+    try:
+        return _features_by_name()[feature_name]
+    except KeyError:
+        raise ValueError(feature_name)
 
 
 def _garden_feat(
@@ -915,15 +932,32 @@ def _garden_feat(
     arch: str|None,
     version: str|None,
     cmd: str = 'cname',
+) -> str:
+    # parse_features is run as a subprocess, and result only depends on the set of features
+    return _garden_feat_cached(
+        platform=platform,
+        mods=frozenset(mods),
+        arch=arch,
+        version=version,
+        cmd=cmd,
+    )
+
+
+@functools.lru_cache
+def _garden_feat_cached(
+    platform: str,
+    mods: typing.FrozenSet[str],
+    arch: str|None,
+    version: str|None,
+    cmd: str,
 ) -> str:
     if not version or not arch:
         cmd = "cname_base"
 
-    all_mods = set(tuple(mods) + (platform,))
-    feature_binary = os.path.abspath(os.path.join(paths.gardenlinux_builder_dir, 'builder', 'parse_features'))
+    all_mods = mods | {platform}
     feature_args=[
-            feature_binary,
-            '--feature-dir', os.path.abspath(os.path.join(paths.gardenlinux_dir, 'features')),
+            parse_features_binary,
+            '--feature-dir', features_dir,
             '--features', ','.join(all_mods),
     ]
 
@@ -185,3 +185,15 @@ def delete_single_image(
 
     uploader = OpenstackImageUploader(openstack_environment_cfg)
     uploader.delete_image(image_name=image_id, dry_run=dry_run)
+
+
+def delete_images_by_id(
+    openstack_environment_cfg: glci.model.OpenstackEnvironment,
+    image_ids: typing.Iterable[str],
+    dry_run: bool
+):
+    """Delete images identified by ID in a given region, authenticating only once"""
+
+    uploader = OpenstackImageUploader(openstack_environment_cfg)
+    for image_id in image_ids:
+        uploader.delete_image(image_name=image_id, dry_run=dry_run)
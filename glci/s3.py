@@ -1,13 +1,27 @@
+import functools
 import os
 import tempfile
 
+import boto3.s3.transfer
+
 import glci.aws
 import glci.model
 import glci.util
 
+# release-artefacts (images) are typically several hundreds of MiBs - transfer them using
+# concurrent (ranged) multipart requests rather than a single stream
+transfer_config = boto3.s3.transfer.TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+)
+
 
+@functools.lru_cache
 def s3_client_for_aws_cfg_name(aws_cfg_name: str):
-    return glci.aws.session(aws_cfg_name).client('s3')
+    # clients are thread-safe and expensive to create - share one per aws-cfg
+    return glci.aws.session(aws_cfg_name).client('s3', config=glci.aws.client_config)
 
 
 def s3_resource_for_aws_cfg_name(aws_cfg_name: str):
@@ -39,6 +53,7 @@ def upload_dir(
                 bucket.upload_file(
                     Filename=src_file_path,
                     Key=dst_file_path,
+                    Config=transfer_config,
                 )
 
 
@@ -55,6 +70,7 @@ def download_file(
     bucket.download_file(
         Key=s3_key,
         Filename=path_to_file,
+        Config=transfer_config,
     )
     return path_to_file
 
@@ -70,6 +86,7 @@ def upload_file(
     bucket.upload_file(
         Filename=file_path,
         Key=s3_key,
+        Config=transfer_config,
     )
 
 
@@ -91,7 +108,11 @@ def download_dir(
 
         os.makedirs(local_dest_dir, exist_ok=True)
 
-        bucket.download_file(Key=s3_obj.key, Filename=local_dest_file_path)
+        bucket.download_file(
+            Key=s3_obj.key,
+            Filename=local_dest_file_path,
+            Config=transfer_config,
+        )
 
 
 def _transport_release_artifact(
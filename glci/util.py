@@ -1,3 +1,4 @@
+import base64
 import concurrent.futures
 import dataclasses
 import datetime
@@ -29,13 +30,69 @@ PublishingCfg = glci.model.PublishingCfg
 
 logger = logging.getLogger(__name__)
 
-
+# prefer libyaml-backed (C) implementations if available
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def run_concurrently(
+    function: typing.Callable,
+    iterable: typing.Iterable,
+    max_workers: int=16,
+) -> list:
+    '''
+    calls `function` for each element of `iterable` using a thread-pool, and returns the results
+    (in the order of `iterable`) once all calls are done. If any call fails, pending calls are
+    cancelled and the first failure (in order of completion) is re-raised.
+    '''
+    args = tuple(iterable)
+    if not args:
+        return []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(args))) as executor:
+        futures = [executor.submit(function, arg) for arg in args]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result() # re-raise exceptions
+        except:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    return [future.result() for future in futures]
+
+
+def iter_concurrently(
+    function: typing.Callable,
+    iterable: typing.Iterable,
+    max_workers: int=16,
+) -> typing.Generator[tuple[typing.Any, typing.Any], None, None]:
+    '''
+    like `run_concurrently`, but streaming: `iterable` is consumed lazily (calls are submitted as
+    elements arrive), and (element, result) pairs are yielded in order of completion.
+    '''
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # {future: element} of calls whose results were not yet yielded
+        futures = {}
+        try:
+            for arg in iterable:
+                futures[executor.submit(function, arg)] = arg
+                for future in [future for future in futures if future.done()]:
+                    yield futures.pop(future), future.result()
+
+            for future in concurrent.futures.as_completed(tuple(futures)):
+                yield futures.pop(future), future.result()
+        except:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+
+@functools.lru_cache
 def publishing_cfg(
     cfg_name: str='default',
     cfg_file=paths.publishing_cfg_path,
 ) -> PublishingCfg:
     with open(cfg_file) as f:
-        parsed = yaml.safe_load(f)
+        parsed = yaml.load(f, Loader=YamlLoader)
 
     for cfg in parsed:
         cfg = dacite.from_dict(
@@ -49,13 +106,14 @@ def publishing_cfg(
         raise ValueError(f'not found: {cfg_name=}')
 
 
+@functools.lru_cache
 def flavour_sets(
     build_yaml: str=paths.flavour_cfg_path,
-) -> typing.List[GardenlinuxFlavourSet]:
+) -> typing.Tuple[GardenlinuxFlavourSet, ...]:
     with open(build_yaml) as f:
-        parsed = yaml.safe_load(f)
+        parsed = yaml.load(f, Loader=YamlLoader)
 
-    sets = [
+    sets = tuple(
         dacite.from_dict(
             data_class=GardenlinuxFlavourSet,
             data=fset,
@@ -63,7 +121,7 @@ def flavour_sets(
                 cast=[Architecture, typing.Tuple]
             )
         ) for fset in parsed['flavour_sets']
-    ]
+    )
 
     return sets
 
@@ -102,7 +160,7 @@ def release_manifest(
         raise e
 
     buf.seek(0)
-    parsed = yaml.safe_load(buf)
+    parsed = yaml.load(buf, Loader=YamlLoader)
 
     # patch-in transient attrs
     parsed['s3_key'] = key
@@ -149,7 +207,7 @@ def release_manifest_set(
         raise e
 
     buf.seek(0)
-    parsed = yaml.safe_load(buf)
+    parsed = yaml.load(buf, Loader=YamlLoader)
 
     parsed['s3_bucket'] = bucket_name
     parsed['s3_key'] = manifest_key
@@ -171,31 +229,13 @@ def release_manifest_set(
     return manifest_set
 
 
-def _json_serialisable_manifest(obj: typing.Any):
-    # workaround: need to convert enums to str recursively
-    # Note this is not a generic implementation, sequences etc. are not converted
-    if hasattr(obj, '__dict__'):
-        if not dataclasses.is_dataclass(obj):
-            raise TypeError(f'cannot json-serialize non dataclass object: {obj}')
-        patch_args = {}
-        for attr, val in obj.__dict__.items():
-            if isinstance(val, enum.Enum):
-                patch_args[attr] = val.value
-            elif dataclasses.is_dataclass(val):
-                patch_args[attr] = _json_serialisable_manifest(val)
-        if patch_args:
-            obj = dataclasses.replace(obj, **patch_args)
-    return obj
-
-
 def upload_release_manifest(
     s3_client: botocore.client.BaseClient,
     bucket_name: str,
     key: str,
     manifest: glci.model.ReleaseManifest,
 ):
-    manifest = _json_serialisable_manifest(obj=manifest)
-    manifest_bytes = yaml.safe_dump(dataclasses.asdict(manifest)).encode('utf-8')
+    manifest_bytes = yaml.dump(manifest, Dumper=EnumValueYamlDumper, encoding='utf-8')
     manifest_fobj = io.BytesIO(initial_bytes=manifest_bytes)
     return s3_client.upload_fileobj(
         Fileobj=manifest_fobj,
@@ -214,10 +254,7 @@ def upload_release_manifest_set(
     key: str,
     manifest_set: glci.model.ReleaseManifestSet,
 ):
-    manifests = (_json_serialisable_manifest(m) for m in manifest_set.manifests)
-    manifest_set = dataclasses.replace(manifest_set, manifests=tuple(manifests))
-
-    manifest_set_bytes = yaml.safe_dump(dataclasses.asdict(manifest_set)).encode('utf-8')
+    manifest_set_bytes = yaml.dump(manifest_set, Dumper=EnumValueYamlDumper, encoding='utf-8')
     manifest_set_fobj = io.BytesIO(initial_bytes=manifest_set_bytes)
 
     return s3_client.upload_fileobj(
@@ -243,34 +280,20 @@ def enumerate_releases(
         bucket_name=bucket_name,
     )
 
-    continuation_token = None
-    while True:
-        ctoken_args = {'ContinuationToken': continuation_token} \
-                if continuation_token \
-                else {}
+    def wrap_release_manifest(key):
+        return _release_manifest(key=key)
 
-        res = s3_client.list_objects_v2(
-            Bucket=bucket_name,
-            Prefix=prefix,
-            **ctoken_args,
-        )
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for res in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
         if (key_count := res['KeyCount']) == 0:
             return
-        is_truncated = bool(res['IsTruncated'])
-        continuation_token = res.get('NextContinuationToken')
 
         logger.info(f'found {key_count} release manifests')
 
-        def wrap_release_manifest(key):
-            return _release_manifest(key=key)
-
         keys = [obj_dict['Key'] for obj_dict in res['Contents']]
 
         yield from executor.map(wrap_release_manifest, keys)
 
-        if not is_truncated:
-            return
-
 
 def find_release(
     s3_client: botocore.client.BaseClient,
@@ -312,9 +335,27 @@ def find_releases(
     version: str,
     gardenlinux_epoch: int,
 ) -> typing.Generator[glci.model.OnlineReleaseManifest, None, None]:
-    flavours = set(fset.flavours())
+    yield from find_releases_for_flavours(
+        s3_client=s3_client,
+        bucket_name=bucket_name,
+        flavours=fset.flavours(),
+        build_committish=build_committish,
+        version=version,
+        gardenlinux_epoch=gardenlinux_epoch,
+    )
+
+
+def find_releases_for_flavours(
+    s3_client: botocore.client.BaseClient,
+    bucket_name: str,
+    flavours: typing.Iterable[glci.model.GardenlinuxFlavour],
+    build_committish: str,
+    version: str,
+    gardenlinux_epoch: int,
+) -> typing.Generator[glci.model.OnlineReleaseManifest, None, None]:
+    flavours = set(flavours)
 
-    for flavour in flavours:
+    def _find_release(flavour: glci.model.GardenlinuxFlavour):
         release_identifier = glci.model.ReleaseIdentifier(
             build_committish=build_committish,
             version=version,
@@ -324,16 +365,38 @@ def find_releases(
             modifiers=flavour.modifiers,
         )
 
-        existing_release = find_release(
+        return find_release(
             s3_client=s3_client,
             bucket_name=bucket_name,
             release_identifier=release_identifier,
         )
 
+    # lookups are independent s3-roundtrips - run them concurrently, and yield found releases as
+    # soon as they are available
+    for _, existing_release in iter_concurrently(_find_release, flavours):
         if existing_release:
             yield existing_release
 
 
+def b64encoded_release_files(
+    s3_client: botocore.client.BaseClient,
+    release: glci.model.OnlineReleaseManifest,
+    suffixes: typing.Sequence[str],
+) -> typing.Tuple[str, ...]:
+    '''
+    retrieves the (small) release-files of given suffixes concurrently, and returns their contents
+    base64-encoded (in the order of the given suffixes)
+    '''
+    def b64encoded_release_file(suffix: str) -> str:
+        resp = s3_client.get_object(
+            Bucket=release.s3_bucket,
+            Key=release.path_by_suffix(suffix).s3_key,
+        )
+        return base64.b64encode(resp['Body'].read()).decode()
+
+    return tuple(run_concurrently(b64encoded_release_file, suffixes, max_workers=len(suffixes)))
+
+
 def release_set_manifest_name(
     build_committish: str,
     gardenlinux_epoch: int,
@@ -368,40 +431,29 @@ def enumerate_release_sets(
         bucket_name=bucket_name,
     )
 
-    continuation_token = None
-    while True:
-        ctoken_args = {'ContinuationToken': continuation_token} \
-                if continuation_token \
-                else {}
+    def wrap_release_manifest_set(key):
+        # filter out directories (done in worker, as it costs a roundtrip per key)
+        if s3_client.head_object(
+          Bucket=bucket_name,
+          Key=key,
+        )['ContentType'] == 'application/x-directory':
+            return None
 
-        res = s3_client.list_objects_v2(
-            Bucket=bucket_name,
-            Prefix=prefix,
-            **ctoken_args,
-        )
+        return _release_manifest_set(manifest_key=key)
+
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for res in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
         if (key_count := res['KeyCount']) == 0:
             return
-        is_truncated = bool(res['IsTruncated'])
-        continuation_token = res.get('NextContinuationToken')
 
         logger.info(f'found {key_count} release manifests')
 
-        keys = [
-            key for obj_dict in res['Contents']
-            # filter out directories
-            if s3_client.head_object(
-              Bucket=bucket_name,
-              Key=(key := obj_dict['Key']),
-            )['ContentType'] != 'application/x-directory'
-        ]
-
-        def wrap_release_manifest_set(key):
-          return _release_manifest_set(manifest_key=key)
-
-        yield from executor.map(wrap_release_manifest_set, keys)
+        keys = [obj_dict['Key'] for obj_dict in res['Contents']]
 
-        if not is_truncated:
-            return
+        yield from (
+            manifest_set for manifest_set in executor.map(wrap_release_manifest_set, keys)
+            if manifest_set is not None
+        )
 
 
 def find_release_set(
@@ -441,41 +493,52 @@ def find_release_set(
     return manifest
 
 
-class EnumValueYamlDumper(yaml.SafeDumper):
+class EnumValueYamlDumper(YamlDumper):
     """
-    a yaml.SafeDumper that will dump enum objects using their values
+    a yaml.SafeDumper (libyaml-backed, if available) that will dump enum objects using their
+    values, and dataclass instances as mappings of their fields (without copying them through
+    `dataclasses.asdict` first)
     """
     def represent_data(self, data):
         if isinstance(data, enum.Enum):
             return self.represent_data(data.value)
+        if dataclasses.is_dataclass(data) and not isinstance(data, type):
+            return self.represent_dict({
+                field.name: getattr(data, field.name) for field in dataclasses.fields(data)
+            })
         return super().represent_data(data)
 
+    def ignore_aliases(self, data):
+        # dataclasses are not copied, so shared values must not be emitted as anchors/aliases
+        return True
+
+
+# map each platform to the suffix/object that is of interest.
+_platform_to_artifact_mapping = {
+    'ali': '.qcow2',
+    'aws': '.raw',
+    'azure': '.vhd',
+    'gcp': '.gcpimage.tar.gz',
+    'kvm': '.raw',
+    'metal': '.tar.xz',
+    'oci': '.tar.xz',
+    'openstack': '.vmdk',
+    'openstackbaremetal': '.vmdk',
+    'vmware': '.ova',
+}
+
 
 def vm_image_artefact_for_platform(platform: glci.model.Platform) -> str:
-    # map each platform to the suffix/object that is of interest.
-
-    platform_to_artifact_mapping = {
-        'ali': '.qcow2',
-        'aws': '.raw',
-        'azure': '.vhd',
-        'gcp': '.gcpimage.tar.gz',
-        'kvm': '.raw',
-        'metal': '.tar.xz',
-        'oci': '.tar.xz',
-        'openstack': '.vmdk',
-        'openstackbaremetal': '.vmdk',
-        'vmware': '.ova',
-    }
-
-    if not platform in platform_to_artifact_mapping:
+    if not platform in _platform_to_artifact_mapping:
         raise NotImplementedError(
             f"No information about release artifacts available for platform '{platform}'"
         )
 
-    return platform_to_artifact_mapping[platform]
+    return _platform_to_artifact_mapping[platform]
 
 
+@functools.lru_cache
 def package_aliases(package_alias_file: str = paths.package_alias_path) -> dict:
     with open(package_alias_file) as f:
-        parsed = yaml.safe_load(f)
+        parsed = yaml.load(f, Loader=YamlLoader)
     return parsed.get('aliases', {})
@@ -15,6 +15,7 @@ import ci.util
 import glci.aws
 import glci.az
 import glci.gcp
+import glci.s3
 import glci.util
 import glci.model as gm
 from glci.model import OnlineReleaseManifest
@@ -84,9 +85,9 @@ def _publish_alicloud_image(
         aliyun_cfg,
     )
 
-    s3_client = glci.aws.session(
+    s3_client = glci.s3.s3_client_for_aws_cfg_name(
         publishing_cfg.origin_buildresult_bucket.aws_cfg_name,
-    ).client('s3')
+    )
     maker.cp_image_from_s3(s3_client)
     return maker.make_image()
 
@@ -113,12 +114,11 @@ def _publish_azure_image(
     for azure_publishing_cfg in azure_publishing_cfgs:
         logger.info(f"targetting {azure_publishing_cfg.cloud}")
 
-        aws_session = glci.aws.session(
+        s3_client = glci.s3.s3_client_for_aws_cfg_name(
             publishing_cfg.buildresult_bucket(azure_publishing_cfg.buildresult_bucket).aws_cfg_name
                 if azure_publishing_cfg.buildresult_bucket
                 else publishing_cfg.origin_buildresult_bucket.aws_cfg_name,
         )
-        s3_client = aws_session.client('s3')
         cfg_factory = ci.util.ctx().cfg_factory()
 
         storage_account_cfg = cfg_factory.azure_storage_account(
@@ -180,9 +180,9 @@ def _publish_gcp_image(
     cfg_factory = ci.util.ctx().cfg_factory()
     gcp_cfg = cfg_factory.gcp(gcp_publishing_cfg.gcp_cfg_name)
     storage_client = glci.gcp.cloud_storage_client(gcp_cfg)
-    s3_client = glci.aws.session(
+    s3_client = glci.s3.s3_client_for_aws_cfg_name(
         publishing_cfg.origin_buildresult_bucket.aws_cfg_name,
-    ).client('s3')
+    )
 
     compute_client = glci.gcp.authenticated_build_func(gcp_cfg)('compute', 'v1')
 
@@ -207,9 +207,9 @@ def _publish_oci_image(
     oci_publishing_cfg = publishing_cfg.target(release.platform)
 
     oci_client = ccc.oci.oci_client()
-    s3_client = glci.aws.session(
+    s3_client = glci.s3.s3_client_for_aws_cfg_name(
         publishing_cfg.origin_buildresult_bucket.aws_cfg_name,
-    ).client('s3')
+    )
 
     return glci.oci.publish_image(
         release=release,
@@ -241,12 +241,12 @@ def _publish_openstack_image(
         if openstack_publishing_cfg.cn_regions and project.region() in openstack_publishing_cfg.cn_regions.region_names:
             build_result_bucket = publishing_cfg.buildresult_bucket(openstack_publishing_cfg.cn_regions.buildresult_bucket)
             s3_bucket_access[project.region()] = (
-                glci.aws.session(build_result_bucket.aws_cfg_name).client('s3'),
+                glci.s3.s3_client_for_aws_cfg_name(build_result_bucket.aws_cfg_name),
                 build_result_bucket.bucket_name
             )
         else:
             s3_bucket_access[project.region()] = (
-                glci.aws.session(publishing_cfg.origin_buildresult_bucket.aws_cfg_name).client('s3'),
+                glci.s3.s3_client_for_aws_cfg_name(publishing_cfg.origin_buildresult_bucket.aws_cfg_name),
                 publishing_cfg.origin_buildresult_bucket.bucket_name
             )
 
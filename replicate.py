@@ -7,7 +7,7 @@ import base64
 import botocore.exceptions
 import botocore.client as client
 
-import glci.aws
+import glci.s3
 import glci.model as gm
 import glci.util as gu
 
@@ -78,26 +78,24 @@ def check_replicated_image_blobs(
     source_bucket = publishing_cfg.origin_buildresult_bucket
     target_buckets = publishing_cfg.replica_buildresult_buckets
 
-    s3_source_session = glci.aws.session(source_bucket.aws_cfg_name)
-    s3_source_client = s3_source_session.client('s3')
+    s3_source_client = glci.s3.s3_client_for_aws_cfg_name(source_bucket.aws_cfg_name)
 
     all_replicates_exist = True
 
     for target_bucket in target_buckets:
         logger.info(f'Checking image blob replication from {source_bucket.aws_cfg_name=} to {target_bucket.aws_cfg_name=}')
-        s3_target_session = glci.aws.session(target_bucket.aws_cfg_name)
-        s3_target_client = s3_target_session.client('s3')
+        s3_target_client = glci.s3.s3_client_for_aws_cfg_name(target_bucket.aws_cfg_name)
 
-        for manifest in release_manifests:
+        def check_manifest(manifest: gm.ReleaseManifest) -> bool:
             if not manifest.platform in target_bucket.platforms:
-                continue
+                return True
 
             # hardcoded filtering: only replicate image-artefact (ignore anything else)
             suffix = gu.vm_image_artefact_for_platform(platform=manifest.platform)
             image_blob_ref =  manifest.path_by_suffix(suffix=suffix)
 
             logger.info(f"release artefact {image_blob_ref.s3_key}")
-            replicate_exists = check_blob_size_and_checksum(s3_source_client,
+            return check_blob_size_and_checksum(s3_source_client,
                                 source_bucket.bucket_name,
                                 image_blob_ref.s3_key,
                                 s3_target_client,
@@ -105,6 +103,12 @@ def check_replicated_image_blobs(
                                 image_blob_ref.s3_key
             )
 
-            all_replicates_exist = all_replicates_exist and replicate_exists
+        # checks only issue head-requests - run them concurrently
+        replicates_exist = all([
+            replicate_exists
+            for _, replicate_exists in gu.iter_concurrently(check_manifest, release_manifests)
+        ])
+
+        all_replicates_exist = all_replicates_exist and replicates_exist
 
     return all_replicates_exist